@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+
+class TokenBucketLimiter:
+    """Per-client token buckets refilled at `rate` tokens per second up to `burst`.
+
+    Buckets are kept for at most `max_clients` clients, dropping the least
+    recently seen, so a crawler rotating addresses cannot grow the table
+    without bound. A rate of 0 admits everything.
+    """
+
+    def __init__(self, rate, burst, max_clients=10000):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, client):
+        """Take a token for `client`; returns 0 when admitted, else seconds until a token is available"""
+        if self.rate <= 0:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[client] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+class UpstreamGate:
+    """Cap on concurrent upstream calls, with a bounded queue of callers waiting for a slot.
+
+    A caller that finds `max_waiting` others already queued is turned away
+    at once, and a queued caller gives up after `wait_timeout` seconds, so
+    threads never pile up behind a slow upstream.
+    """
+
+    def __init__(self, max_inflight, max_waiting, wait_timeout):
+        self.max_inflight = max_inflight
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self.inflight = 0
+        self.waiting = 0
+        self.stats = {'admitted': 0, 'queued': 0, 'queue_full': 0, 'queue_timeouts': 0}
+        self._slots = threading.Condition()
+
+    def acquire(self):
+        """Claim a slot, waiting in the queue if needed; returns False when turned away"""
+        with self._slots:
+            if self.inflight >= self.max_inflight:
+                if self.waiting >= self.max_waiting:
+                    self.stats['queue_full'] += 1
+                    return False
+                self.stats['queued'] += 1
+                self.waiting += 1
+                deadline = time.monotonic() + self.wait_timeout
+                try:
+                    while self.inflight >= self.max_inflight:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.stats['queue_timeouts'] += 1
+                            return False
+                        self._slots.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            self.inflight += 1
+            self.stats['admitted'] += 1
+            return True
+
+    def release(self):
+        with self._slots:
+            self.inflight -= 1
+            self._slots.notify()
@@ -1,116 +1,801 @@
-from flask import Flask, render_template, request, jsonify, abort, redirect, url_for
+from flask import Flask, render_template, request, jsonify, abort, redirect, url_for, g, Response, send_from_directory
+from flask import before_render_template, template_rendered
+import click
 import requests
 import os
 import time
-import json
+import hmac
+import fcntl
+import random
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from markupsafe import escape
 from config import Config
+from metrics import MetricsRegistry, endpoint_template, start_flush_thread
+from profiler import StackSampler
+from template_cache import FragmentCacheExtension, bytecode_cache
+import fast_json
+from cache_codec import CompressedEntry, compress_json, resolve_codec
+from cache_policy import CachePolicyTable
+from view_models import Course, Instructor, Organization, Venue, Work, project_payload
+from structured_log import EventLogger, start_queue_logging
+from admission import TokenBucketLimiter, UpstreamGate
+from stats_snapshot import StatsSnapshot
+from ppgas_dataset import PPGASDataset
+from static_export import StaticExporter
+from sitemap import SitemapBuilder
 from dotenv import load_dotenv
 
 load_dotenv()
 
 app = Flask(__name__)
+app.json = fast_json.FastJSONProvider(app)
 app.config.from_object(Config)
+app.jinja_env.bytecode_cache = bytecode_cache(app.config['JINJA_BYTECODE_CACHE_DIR'])
+app.jinja_env.add_extension(FragmentCacheExtension)
+
+if app.config['LOG_LEVEL']:
+    app.logger.setLevel(app.config['LOG_LEVEL'].upper())
+if app.config['LOG_QUEUE_ENABLED']:
+    start_queue_logging(app.logger)
+log = EventLogger(app.logger, app.config['LOG_SAMPLE_RATE'])
+
+metrics = MetricsRegistry()
+metrics.describe('ethnos_upstream_request_duration_seconds', 'histogram', 'Ethnos API call latency per endpoint template')
+metrics.describe('ethnos_upstream_responses_total', 'counter', 'Ethnos API responses by endpoint template and status')
+metrics.describe('ethnos_upstream_retries_total', 'counter', 'Ethnos API retry attempts per endpoint template')
+metrics.describe('ethnos_upstream_timeouts_total', 'counter', 'Ethnos API timeouts per endpoint template')
+metrics.describe('ethnos_upstream_inflight', 'gauge', 'Ethnos API calls currently in flight')
+metrics.describe('ethnos_cache_requests_total', 'counter', 'Cache lookups by result')
+metrics.describe('ethnos_cache_evictions_total', 'counter', 'Cache entries removed after expiring or to stay within CACHE_MAX_ENTRIES')
+metrics.describe('ethnos_cache_entries', 'gauge', 'Entries currently held in the response cache')
+metrics.describe('ethnos_cache_compressed_entries', 'gauge', 'Cache entries held as compressed JSON')
+metrics.describe('ethnos_cache_compressed_bytes', 'gauge', 'Bytes held by compressed cache entries')
+metrics.describe('ethnos_cache_decode_seconds_total', 'counter', 'Time spent decoding compressed cache entries')
+metrics.describe('ethnos_route_duration_seconds', 'histogram', 'Request handling time per route')
+metrics.describe('ethnos_admission_rejections_total', 'counter', 'Requests and upstream calls turned away by reason')
+metrics.describe('ethnos_admission_queue_depth', 'gauge', 'Calls waiting for an upstream slot')
+metrics.describe('ethnos_optional_sections_skipped_total', 'counter', 'Optional page sections skipped for lack of request budget')
 
 @app.before_request
 def block_dev_files():
     if request.path.endswith(('.dev.css', '.dev.js')):
         abort(404)
 
-_cache = {}
+_request_timings = threading.local()
+_request_budget = threading.local()
+_upstream_calls = threading.local()
+
+def remaining_budget():
+    """Seconds left of the current request's upstream budget, or None outside a request"""
+    deadline = getattr(_request_budget, 'deadline', None)
+    return None if deadline is None else deadline - time.time()
+
+def budget_timeout(timeout):
+    """Timeout for the next upstream attempt capped by the request budget, or None when too little is left"""
+    remaining = remaining_budget()
+    if remaining is None:
+        return timeout
+    if remaining < app.config['API_MIN_ATTEMPT_TIMEOUT']:
+        return None
+    return min(timeout, remaining)
+
+def backoff_delay(retry):
+    """Full-jitter exponential backoff before the given retry (1 for the first)"""
+    return random.uniform(0, min(app.config['API_BACKOFF_MAX'], app.config['API_BACKOFF_BASE'] * 2 ** (retry - 1)))
+
+def budget_allows(section):
+    """Whether enough of the request budget is left for an optional page section"""
+    remaining = remaining_budget()
+    if remaining is None or remaining >= app.config['OPTIONAL_SECTION_MIN_BUDGET']:
+        return True
+    metrics.inc('ethnos_optional_sections_skipped_total', {'section': section})
+    log.info('budget.section_skipped', section=section, remaining_ms=round(remaining * 1000))
+    return False
+
+def capture_request_locals():
+    """Request-scoped state of the current thread, for run_with_request_locals on a worker thread"""
+    return (getattr(_request_timings, 'entries', None), getattr(_request_budget, 'deadline', None),
+            getattr(_cache_refresh, 'active', False), getattr(_upstream_calls, 'entries', None))
+
+def run_with_request_locals(request_locals, function, *args):
+    """Call function on a worker thread with the timings, budget and cache mode of the request that spawned it"""
+    (_request_timings.entries, _request_budget.deadline,
+     _cache_refresh.active, _upstream_calls.entries) = request_locals
+    try:
+        return function(*args)
+    finally:
+        _request_timings.entries = None
+        _request_budget.deadline = None
+        _cache_refresh.active = False
+        _upstream_calls.entries = None
+
+def record_timing(name, duration, description=''):
+    """Record a timed step for the Server-Timing header of the current request"""
+    entries = getattr(_request_timings, 'entries', None)
+    if entries is not None:
+        entries.append((name, description, duration))
+
+def format_server_timing(entries, total):
+    """Group timed steps by name and description into a Server-Timing header value"""
+    grouped = {}
+    for name, description, duration in entries:
+        count, elapsed = grouped.get((name, description), (0, 0.0))
+        grouped[(name, description)] = (count + 1, elapsed + duration)
+    
+    parts = []
+    for (name, description), (count, elapsed) in grouped.items():
+        label = f"{description} x{count}" if count > 1 else description
+        label = label.replace('"', "'")
+        parts.append(f'{name};desc="{label}";dur={elapsed * 1000:.1f}')
+    parts.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(parts)
+
+@before_render_template.connect_via(app)
+def _start_template_timer(sender, template, context, **extra):
+    _request_timings.render_started = time.time()
+
+@template_rendered.connect_via(app)
+def _record_template_timing(sender, template, context, **extra):
+    started = getattr(_request_timings, 'render_started', None)
+    if started is not None:
+        record_timing('render', time.time() - started, template.name)
+
+@app.before_request
+def start_route_timer():
+    g.route_started = time.time()
+    _request_timings.entries = []
+    _request_budget.deadline = g.route_started + app.config['REQUEST_BUDGET']
+
+@app.teardown_request
+def clear_request_budget(error=None):
+    _request_budget.deadline = None
+
+@app.after_request
+def record_route_latency(response):
+    if hasattr(g, 'route_started'):
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        elapsed = time.time() - g.route_started
+        metrics.observe('ethnos_route_duration_seconds', elapsed,
+                        {'route': route, 'method': request.method, 'status': response.status_code})
+        log.debug('request.complete', sampled=True, method=request.method, path=request.path,
+                  route=route, status=response.status_code, duration_ms=round(elapsed * 1000, 1))
+    return response
+
+def _should_profile():
+    token = app.config['PROFILER_TOKEN']
+    header = request.headers.get('X-Ethnos-Profile')
+    if token and header and hmac.compare_digest(header, token):
+        return True
+    if request.url_rule and request.url_rule.rule in app.config['PROFILER_ROUTES']:
+        return True
+    rate = app.config['PROFILER_SAMPLE_RATE']
+    return rate > 0 and random.random() < rate
+
+@app.before_request
+def start_profiler():
+    if not (app.config['PROFILER_TOKEN'] or app.config['PROFILER_ROUTES'] or app.config['PROFILER_SAMPLE_RATE']):
+        return
+    if _should_profile():
+        g.profiler = StackSampler(threading.get_ident(), app.config['PROFILER_INTERVAL']).start()
+
+@app.after_request
+def stop_profiler(response):
+    sampler = g.pop('profiler', None)
+    if sampler is None:
+        return response
+    
+    sampler.stop()
+    route = request.url_rule.rule if request.url_rule else request.path
+    try:
+        path = sampler.write_collapsed(app.config['PROFILER_DIR'], route)
+    except OSError as e:
+        app.logger.error(f"Could not write profile for {route}: {e}")
+        return response
+    
+    summary = sampler.summary()
+    app.logger.info(f"Profiled {route}: {sampler.sample_count} samples {summary} -> {path}")
+    response.headers['X-Profile-Summary'] = ', '.join(f"{category}={share}" for category, share in summary.items())
+    return response
+
+@app.after_request
+def add_server_timing(response):
+    entries = getattr(_request_timings, 'entries', None)
+    _request_timings.entries = None
+    if entries is None or not hasattr(g, 'route_started') or not app.config['SERVER_TIMING_ENABLED']:
+        return response
+    
+    total = time.time() - g.route_started
+    response.headers['Server-Timing'] = format_server_timing(entries, total)
+    
+    if (app.config['SERVER_TIMING_FOOTER'] and response.mimetype == 'text/html' and
+            not response.is_streamed and not response.direct_passthrough):
+        rows = ''.join(f"{name:<10} {duration * 1000:8.1f}ms  {description}\n" 
+                       for name, description, duration in entries)
+        footer = f'<pre class="server-timing">{escape(rows)}{"total":<10} {total * 1000:8.1f}ms</pre>'
+        response.set_data(response.get_data(as_text=True).replace('</body>', f'{footer}</body>', 1))
+    return response
+
+_cache = OrderedDict()
 _cache_ttl = {}
+_cache_stale_until = {}
+_cache_lock = threading.Lock()
+_cache_refresh = threading.local()
+_cache_codec = resolve_codec(app.config['CACHE_COMPRESSION'])
+_cache_compression_stats = {'decodes': 0, 'decode_seconds': 0.0, 'encode_seconds': 0.0}
 
 def get_cached_data(key):
+    if getattr(_cache_refresh, 'active', False):
+        return None
     if key in _cache and key in _cache_ttl:
-        if time.time() < _cache_ttl[key]:
-            return _cache[key]
-        else:
-            del _cache[key]
-            del _cache_ttl[key]
+        now = time.time()
+        if now < _cache_ttl[key]:
+            with _cache_lock:
+                value = _cache.get(key)
+                if value is not None:
+                    _cache.move_to_end(key)
+            if value is not None:
+                metrics.inc('ethnos_cache_requests_total', {'result': 'hit'})
+                return _decode_cached(value, 'hit')
+        elif now >= _cache_stale_until.get(key, 0):
+            with _cache_lock:
+                _evict_cached(key)
+            metrics.inc('ethnos_cache_evictions_total', {'reason': 'expired'})
+    metrics.inc('ethnos_cache_requests_total', {'result': 'miss'})
     return None
 
-def set_cached_data(key, data, duration=None):
+def _evict_cached(key):
+    _cache.pop(key, None)
+    _cache_ttl.pop(key, None)
+    _cache_stale_until.pop(key, None)
+
+def is_cached(key):
+    """Whether a fresh entry exists for key, without decoding it or counting a cache lookup"""
+    return key in _cache and time.time() < _cache_ttl.get(key, 0)
+
+def get_stale_data(key):
+    """An expired entry still inside its stale grace period, to answer for a failing upstream"""
+    value = _cache.get(key)
+    if value is None or time.time() >= _cache_stale_until.get(key, 0):
+        return None
+    metrics.inc('ethnos_cache_requests_total', {'result': 'stale'})
+    return _decode_cached(value, 'stale')
+
+def _decode_cached(value, description):
+    if not isinstance(value, CompressedEntry):
+        record_timing('cache', 0.0, description)
+        return value
+    started = time.time()
+    value = value.decode()
+    elapsed = time.time() - started
+    _cache_compression_stats['decodes'] += 1
+    _cache_compression_stats['decode_seconds'] += elapsed
+    metrics.inc('ethnos_cache_decode_seconds_total', value=elapsed)
+    record_timing('cache', elapsed, f'{description} compressed')
+    return value
+
+def set_cached_data(key, data, duration=None, raw=None, stale=0):
     cache_duration = duration or app.config['CACHE_DURATION']
-    _cache[key] = data
-    _cache_ttl[key] = time.time() + cache_duration
+    if _cache_codec and isinstance(data, (dict, list)):
+        started = time.time()
+        data = compress_json(data, _cache_codec, app.config['CACHE_COMPRESSION_THRESHOLD'],
+                             app.config['CACHE_COMPRESSION_LEVEL'], raw)
+        _cache_compression_stats['encode_seconds'] += time.time() - started
+    with _cache_lock:
+        _cache[key] = data
+        _cache.move_to_end(key)
+        _cache_ttl[key] = time.time() + cache_duration
+        if stale:
+            _cache_stale_until[key] = _cache_ttl[key] + stale
+        else:
+            _cache_stale_until.pop(key, None)
+        # Least recently used entries go first, so a crawl of the id space cannot grow the cache without bound
+        evicted = 0
+        while len(_cache) > app.config['CACHE_MAX_ENTRIES']:
+            _evict_cached(next(iter(_cache)))
+            evicted += 1
+    if evicted:
+        metrics.inc('ethnos_cache_evictions_total', {'reason': 'capacity'}, value=evicted)
+
+if app.config['FRAGMENT_CACHE_ENABLED']:
+    app.jinja_env.fragment_cache_get = get_cached_data
+    app.jinja_env.fragment_cache_set = set_cached_data
+
+_upstream_load = {'inflight': 0, 'latency_ewma': 0.0, 'updated': 0.0}
+_upstream_load_lock = threading.Lock()
+
+upstream_gate = UpstreamGate(app.config['ADMISSION_MAX_UPSTREAM_INFLIGHT'], app.config['ADMISSION_MAX_QUEUE'],
+                             app.config['ADMISSION_QUEUE_TIMEOUT'])
+client_limiter = TokenBucketLimiter(app.config['ADMISSION_CLIENT_RATE'], app.config['ADMISSION_CLIENT_BURST'])
+_admission_stats = {'rate_limited': 0, 'shed': 0, 'served_stale': 0, 'upstream_rejected': 0}
 
-def api_request(endpoint, params=None, retry_count=None, use_cache=False, timeout=None):
-    """Make a request to the Ethnos API with comprehensive error handling"""
+# Cheap endpoints that never call the API, kept reachable for monitoring while pages are shed
+ADMISSION_EXEMPT_ENDPOINTS = frozenset({
+    'static', 'metrics_endpoint', 'sitemap_index', 'sitemap_file',
+    'api_statistics', 'api_statistics_status', 'api_cache_stats', 'api_search_cache_stats',
+    'api_prefetch_stats', 'api_admission_stats'
+})
+
+# Browse pages whose last good rendering is kept to serve while shedding load
+STALE_PAGE_ENDPOINTS = frozenset({
+    'home', 'works_list', 'venues_list', 'venues_complete', 'organizations_complete',
+    'ppgas_home', 'courses_ppgas', 'courses_list', 'instructors_list'
+})
+
+def _admission_exempt():
+    return request.endpoint in ADMISSION_EXEMPT_ENDPOINTS
+
+def _client_id():
+    if app.config['ADMISSION_TRUST_FORWARDED'] and request.access_route:
+        return request.access_route[0]
+    return request.remote_addr or 'unknown'
+
+def _page_cache_key():
+    return fast_json.canonical_key(f"page:{request.path}", request.args.to_dict(flat=False))
+
+def upstream_overloaded():
+    """Whether the upstream API is slow or backed up enough to shed new page requests
+
+    The latency average only counts while calls keep completing, so once
+    shedding has let the upstream rest for ADMISSION_RETRY_AFTER seconds new
+    requests probe it again.
+    """
+    if upstream_gate.waiting >= app.config['ADMISSION_SHED_QUEUE_DEPTH']:
+        return True
+    recent = time.time() - _upstream_load['updated'] < app.config['ADMISSION_RETRY_AFTER']
+    return recent and _upstream_load['latency_ewma'] >= app.config['ADMISSION_SHED_LATENCY']
+
+def _reject(status, retry_after, reason):
+    _admission_stats[reason] += 1
+    metrics.inc('ethnos_admission_rejections_total', {'reason': reason})
+    if request.path.startswith('/api/'):
+        response = jsonify({'error': 'Serviço sobrecarregado, tente novamente mais tarde'})
+    else:
+        response = Response(render_template(f'errors/{status}.html'), mimetype='text/html')
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, round(retry_after)))
+    return response
+
+@app.before_request
+def admit_request():
+    if not app.config['ADMISSION_ENABLED'] or _admission_exempt():
+        return None
+    
+    wait = client_limiter.acquire(_client_id())
+    if wait:
+        log.warning('admission.rate_limited', client=_client_id(), path=request.path)
+        return _reject(429, wait, 'rate_limited')
+    
+    if upstream_overloaded():
+        stale_page = (get_cached_data(_page_cache_key())
+                      if request.method == 'GET' and request.endpoint in STALE_PAGE_ENDPOINTS else None)
+        if stale_page is not None:
+            _admission_stats['served_stale'] += 1
+            response = Response(stale_page, mimetype='text/html')
+            response.headers['X-Ethnos-Stale'] = '1'
+            return response
+        log.warning('admission.shed', path=request.path, inflight=upstream_gate.inflight,
+                    waiting=upstream_gate.waiting, latency_ewma=round(_upstream_load['latency_ewma'], 3))
+        return _reject(503, app.config['ADMISSION_RETRY_AFTER'], 'shed')
+    return None
+
+@app.after_request
+def keep_stale_page(response):
+    """Keep the last good rendering of browse pages to serve while shedding load
+
+    Only the listings in STALE_PAGE_ENDPOINTS addressed by path and page
+    number are kept; detail pages and search queries would fill the cache
+    with renderings that are rarely asked for again.
+    """
+    duration = app.config['ADMISSION_STALE_PAGE_DURATION']
+    if (app.config['ADMISSION_ENABLED'] and duration and request.method == 'GET' and
+            request.endpoint in STALE_PAGE_ENDPOINTS and set(request.args) <= {'page'} and
+            response.status_code == 200 and response.mimetype == 'text/html' and
+            'X-Ethnos-Stale' not in response.headers and not response.direct_passthrough and
+            not response.is_streamed):
+        set_cached_data(_page_cache_key(), response.get_data(), duration)
+    return response
+
+def get_admission_stats():
+    """Admission control counters with the current upstream slots and queue"""
+    return {
+        **_admission_stats,
+        **upstream_gate.stats,
+        'inflight': upstream_gate.inflight,
+        'max_inflight': upstream_gate.max_inflight,
+        'waiting': upstream_gate.waiting,
+        'max_waiting': upstream_gate.max_waiting,
+        'latency_ewma': round(_upstream_load['latency_ewma'], 3),
+        'overloaded': upstream_overloaded(),
+        'tracked_clients': len(client_limiter)
+    }
+
+def _api_cache_key(endpoint, params, model=None):
+    return fast_json.canonical_key(f"{endpoint}#{model.__name__}" if model else endpoint, params)
+
+def _record_upstream_call(started, endpoint_label):
+    elapsed = time.time() - started
+    with _upstream_load_lock:
+        _upstream_load['inflight'] -= 1
+        _upstream_load['latency_ewma'] = 0.8 * _upstream_load['latency_ewma'] + 0.2 * elapsed
+        _upstream_load['updated'] = time.time()
+    metrics.observe('ethnos_upstream_request_duration_seconds', elapsed, {'endpoint': endpoint_label})
+    record_timing('upstream', elapsed, endpoint_label)
+    return elapsed
+
+NOT_FOUND = object()
+
+cache_policies = CachePolicyTable(app.config['CACHE_POLICIES'], app.config['CACHE_POLICY_DEFAULTS'])
+
+def api_request(endpoint, params=None, retry_count=None, use_cache=None, timeout=None, model=None):
+    """Make a request to the Ethnos API with comprehensive error handling
+    
+    Whether and for how long the response is cached comes from the endpoint's
+    entry in CACHE_POLICIES unless `use_cache` is given. When the upstream
+    fails, an expired entry still inside its stale grace period is returned.
+    With a view model, listing records are projected into it before caching.
+    """
+    endpoint_label = endpoint_template(endpoint)
+    policy = cache_policies.lookup(endpoint_label)
+    if use_cache is None:
+        use_cache = policy.cache
+    
     if use_cache:
-        cache_key = f"{endpoint}:{json.dumps(params, sort_keys=True) if params else 'None'}"
+        cache_key = _api_cache_key(endpoint, params, model)
         cached_result = get_cached_data(cache_key)
         if cached_result is not None:
-            app.logger.debug(f"Cache hit: {endpoint}")
-            return cached_result
+            log.debug('cache.hit', sampled=True, endpoint=endpoint)
+            prefetch_expires = _prefetched_keys.pop(cache_key, None)
+            if prefetch_expires:
+                _prefetch_stats['hits' if prefetch_expires > time.time() else 'wasted'] += 1
+            return None if cached_result is NOT_FOUND else cached_result
+    
+    data, content = _fetch_upstream(endpoint, params, retry_count, timeout, endpoint_label)
+    calls = getattr(_upstream_calls, 'entries', None)
+    if calls is not None:
+        calls.append((endpoint_label, data is not None))
+    
+    if data is NOT_FOUND:
+        if use_cache and policy.negative_ttl:
+            set_cached_data(cache_key, NOT_FOUND, policy.negative_ttl)
+        return None
+    
+    if data is None:
+        stale_result = get_stale_data(cache_key) if use_cache and policy.stale else None
+        if stale_result is not None:
+            log.warning('cache.serve_stale', endpoint=endpoint)
+            return None if stale_result is NOT_FOUND else stale_result
+        return None
+    
+    ingest = INGEST_STEPS.get(endpoint_label)
+    if ingest:
+        data = ingest(data)
+    if model:
+        data = project_payload(data, model)
+    
+    if use_cache and (not policy.max_bytes or len(content) <= policy.max_bytes):
+        set_cached_data(cache_key, data, policy.ttl, raw=None if ingest or model else content, stale=policy.stale)
+    
+    return data
+
+def _fetch_upstream(endpoint, params, retry_count, timeout, endpoint_label):
+    """Call the Ethnos API with retries inside the request budget
     
+    Returns the decoded payload and the response body, (NOT_FOUND, None) for
+    a 404 and (None, None) when the call failed.
+    """
     url = f"{app.config['API_BASE_URL']}{endpoint}"
     request_timeout = timeout or app.config['API_TIMEOUT']
-    retry_count = retry_count or app.config['API_RETRY_COUNT']
+    retry_count = app.config['API_RETRY_COUNT'] if retry_count is None else retry_count
     
     for attempt in range(retry_count + 1):
+        if attempt:
+            delay = backoff_delay(attempt)
+            remaining = remaining_budget()
+            if remaining is not None and remaining - delay < app.config['API_MIN_ATTEMPT_TIMEOUT']:
+                log.error('upstream.gave_up', url=url, reason='budget', attempts=attempt)
+                return None, None
+            time.sleep(delay)
+            metrics.inc('ethnos_upstream_retries_total', {'endpoint': endpoint_label})
+        
+        attempt_timeout = budget_timeout(request_timeout)
+        if attempt_timeout is None:
+            log.warning('upstream.budget_exhausted', endpoint=endpoint, attempt=attempt + 1)
+            return None, None
         try:
-            app.logger.debug(f"API request attempt {attempt + 1}: {url} with params {params}")
+            log.debug('upstream.attempt', sampled=True, endpoint=endpoint, attempt=attempt + 1, params=params)
             
-            response = requests.get(
-                url, 
-                params=params, 
-                timeout=request_timeout,
-                headers={
-                    'User-Agent': 'ethnos_app/1.0 (Academic Research Tool)',
-                    'Accept': 'application/json'
-                }
-            )
+            gated = app.config['ADMISSION_ENABLED']
+            if gated and not upstream_gate.acquire():
+                _admission_stats['upstream_rejected'] += 1
+                metrics.inc('ethnos_admission_rejections_total', {'reason': 'upstream_rejected'})
+                log.warning('upstream.rejected', endpoint=endpoint, inflight=upstream_gate.inflight,
+                            waiting=upstream_gate.waiting)
+                return None, None
+            with _upstream_load_lock:
+                _upstream_load['inflight'] += 1
+            started = time.time()
+            try:
+                response = requests.get(
+                    url, 
+                    params=params, 
+                    timeout=attempt_timeout,
+                    headers={
+                        'User-Agent': 'ethnos_app/1.0 (Academic Research Tool)',
+                        'Accept': 'application/json'
+                    }
+                )
+            finally:
+                elapsed = _record_upstream_call(started, endpoint_label)
+                if gated:
+                    upstream_gate.release()
             
-            app.logger.debug(f"API response: status={response.status_code}, url={response.url}")
+            metrics.inc('ethnos_upstream_responses_total', {'endpoint': endpoint_label, 'status': response.status_code})
+            log.debug('upstream.response', sampled=True, endpoint=endpoint, url=response.url,
+                      status=response.status_code, bytes=len(response.content), duration_ms=round(elapsed * 1000, 1))
             
             if response.status_code == 200:
                 try:
-                    data = response.json()
-                    app.logger.debug(f"API success: {endpoint} returned {len(str(data))} chars")
-                    
-                    if use_cache:
-                        cache_key = f"{endpoint}:{json.dumps(params, sort_keys=True) if params else 'None'}"
-                        set_cached_data(cache_key, data)
-                    
-                    return data
+                    return fast_json.loads(response.content), response.content
                 except ValueError as json_error:
-                    app.logger.error(f"Invalid JSON response from {url}: {json_error}")
-                    return None
+                    log.error('upstream.invalid_json', url=url, error=json_error)
+                    return None, None
             
             elif response.status_code == 404:
-                app.logger.warning(f"API endpoint not found: {url}")
-                return None
+                log.warning('upstream.not_found', url=url)
+                return NOT_FOUND, None
             
             elif response.status_code >= 500:
-                app.logger.error(f"API server error {response.status_code} on {url}")
+                log.error('upstream.server_error', url=url, status=response.status_code, attempt=attempt + 1)
                 if attempt < retry_count:
                     continue
-                return None
+                return None, None
             
             else:
-                app.logger.error(f"API request failed with status {response.status_code}: {url}")
-                return None
+                log.error('upstream.failed', url=url, status=response.status_code)
+                return None, None
                 
         except requests.exceptions.Timeout as e:
-            app.logger.warning(f"API timeout on attempt {attempt + 1}: {url} - {e}")
+            metrics.inc('ethnos_upstream_timeouts_total', {'endpoint': endpoint_label})
+            log.warning('upstream.timeout', url=url, attempt=attempt + 1, error=e)
             if attempt == retry_count:
-                app.logger.error(f"API timeout after {retry_count + 1} attempts: {url}")
-                return None
+                log.error('upstream.gave_up', url=url, reason='timeout', attempts=retry_count + 1)
+                return None, None
                 
         except requests.exceptions.ConnectionError as e:
-            app.logger.warning(f"API connection error on attempt {attempt + 1}: {url} - {e}")
+            log.warning('upstream.connection_error', url=url, attempt=attempt + 1, error=e)
             if attempt == retry_count:
-                app.logger.error(f"API connection failed after {retry_count + 1} attempts: {url}")
-                return None
+                log.error('upstream.gave_up', url=url, reason='connection', attempts=retry_count + 1)
+                return None, None
                 
         except requests.exceptions.RequestException as e:
-            app.logger.error(f"API request exception: {url} - {e}")
-            return None
+            log.error('upstream.exception', url=url, error=e)
+            return None, None
             
         except Exception as e:
-            app.logger.error(f"Unexpected error in API request to {url}: {e}")
-            return None
+            log.error('upstream.unexpected_error', url=url, error=e)
+            return None, None
     
-    return None
+    return None, None
+
+_search_cache_stats = {}
+
+def normalize_search_query(query):
+    """Canonical form of a search query: case-folded, collapsed whitespace, optionally accent-free"""
+    normalized = ' '.join(str(query).casefold().split())
+    if app.config['SEARCH_FOLD_ACCENTS']:
+        normalized = ''.join(char for char in unicodedata.normalize('NFKD', normalized)
+                             if not unicodedata.combining(char))
+    return normalized
+
+def search_cache_key(endpoint, params):
+    """Build a cache key that is stable across query spelling variants and filter order"""
+    canonical = {key: value for key, value in (params or {}).items() if value not in (None, '')}
+    for field in ('q', 'name', 'venue'):
+        if field in canonical:
+            canonical[field] = normalize_search_query(canonical[field])
+    return fast_json.canonical_key(f"search:{endpoint}", canonical)
+
+def cached_search_request(endpoint, params, timeout=None):
+    """Run a search API call through the search result cache"""
+    cache_key = search_cache_key(endpoint, params)
+    stats = _search_cache_stats.setdefault(endpoint, {'hits': 0, 'misses': 0})
+    
+    cached_result = get_cached_data(cache_key)
+    if cached_result is not None:
+        stats['hits'] += 1
+        return cached_result
+    
+    stats['misses'] += 1
+    result = api_request(endpoint, params, use_cache=False, timeout=timeout)
+    if result is not None and result.get('status') != 'error':
+        set_cached_data(cache_key, result, app.config['SEARCH_CACHE_DURATION'])
+    return result
+
+def get_search_cache_stats():
+    """Hit/miss counters and hit rate per search endpoint"""
+    report = {}
+    for endpoint, stats in _search_cache_stats.items():
+        lookups = stats['hits'] + stats['misses']
+        report[endpoint] = {
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+            'hit_rate': round(stats['hits'] / lookups, 4) if lookups else 0.0
+        }
+    return report
+
+_prefetch_executor = ThreadPoolExecutor(max_workers=app.config['PREFETCH_CONCURRENCY'],
+                                        thread_name_prefix='prefetch')
+_prefetch_budget = threading.BoundedSemaphore(app.config['PREFETCH_CONCURRENCY'])
+_prefetched_keys = {}
+_prefetch_stats = {'issued': 0, 'hits': 0, 'wasted': 0, 'skipped_budget': 0, 'skipped_load': 0}
+
+def _upstream_under_load():
+    return (_upstream_load['inflight'] >= app.config['PREFETCH_MAX_INFLIGHT'] or
+            _upstream_load['latency_ewma'] >= app.config['PREFETCH_MAX_LATENCY'])
+
+def _prefetch_page(endpoint, params, cache_key, model):
+    try:
+        if api_request(endpoint, params, use_cache=True, model=model) is not None:
+            _prefetched_keys[cache_key] = time.time() + cache_policies.lookup(endpoint_template(endpoint)).ttl
+    except Exception as e:
+        log.debug('prefetch.failed', endpoint=endpoint, error=e)
+    finally:
+        _prefetch_budget.release()
+
+def prefetch_next_page(endpoint, params, has_next, model=None):
+    """Speculatively fetch the following page of a listing into the cache"""
+    if not app.config['PREFETCH_ENABLED'] or not has_next:
+        return
+    
+    next_params = {**params, 'page': params.get('page', 1) + 1}
+    cache_key = _api_cache_key(endpoint, next_params, model)
+    _prune_prefetched_keys()
+    if cache_key in _prefetched_keys or is_cached(cache_key):
+        return
+    
+    if _upstream_under_load():
+        _prefetch_stats['skipped_load'] += 1
+        return
+    
+    if not _prefetch_budget.acquire(blocking=False):
+        _prefetch_stats['skipped_budget'] += 1
+        return
+    
+    _prefetch_stats['issued'] += 1
+    _prefetch_executor.submit(_prefetch_page, endpoint, next_params, cache_key, model)
+
+def _prune_prefetched_keys():
+    """Forget prefetched pages whose cache entry expired before anyone read them, counting them as wasted"""
+    now = time.time()
+    for cache_key, expires in list(_prefetched_keys.items()):
+        if expires <= now and _prefetched_keys.pop(cache_key, None):
+            _prefetch_stats['wasted'] += 1
+
+def get_prefetch_stats():
+    """Prefetch counters with hit and waste ratios"""
+    _prune_prefetched_keys()
+    
+    settled = _prefetch_stats['hits'] + _prefetch_stats['wasted']
+    return {
+        **_prefetch_stats,
+        'pending': len(_prefetched_keys),
+        'hit_ratio': round(_prefetch_stats['hits'] / settled, 4) if settled else 0.0,
+        'waste_ratio': round(_prefetch_stats['wasted'] / settled, 4) if settled else 0.0
+    }
+
+_fill_executor = ThreadPoolExecutor(max_workers=app.config['FILL_PAGE_CONCURRENCY'],
+                                    thread_name_prefix='fill-page')
+
+def _scan_upstream(fetch_page, first_page, state):
+    """Yield (upstream_page, index, record) from first_page on, fetching the following pages in parallel.
+
+    Stops at the last upstream page, after FILL_PAGE_MAX_UPSTREAM_PAGES pages
+    or at a failed fetch, and notes which in `state`. Pages fetched ahead
+    and left unread still land in the response cache.
+    """
+    request_locals = capture_request_locals()
+
+    last_page = first_page + app.config['FILL_PAGE_MAX_UPSTREAM_PAGES'] - 1
+    ahead = 1
+    pending = {}
+    upstream_page = first_page
+    while upstream_page <= last_page:
+        for n in range(upstream_page, min(upstream_page + ahead, last_page + 1)):
+            if n not in pending:
+                pending[n] = _fill_executor.submit(run_with_request_locals, request_locals, fetch_page, n)
+        try:
+            payload = pending.pop(upstream_page).result()
+        except Exception as e:
+            log.warning('fill.fetch_failed', page=upstream_page, error=e)
+            payload = None
+        if not payload or not isinstance(payload.get('data'), list):
+            state['failed'] = True
+            return
+
+        pagination = payload.get('pagination') or {}
+        state['upstream_pages'] = state.get('upstream_pages', 0) + 1
+        state['upstream_total'] = pagination.get('total', 0)
+        total_pages = pagination.get('totalPages') or pagination.get('pages')
+        if total_pages:
+            last_page = min(last_page, total_pages)
+        ahead = app.config['FILL_PAGE_CONCURRENCY']
+
+        for index, record in enumerate(payload['data']):
+            yield upstream_page, index, record
+        if not payload['data'] or not pagination.get('hasNext', upstream_page < (total_pages or 0)):
+            state['exhausted'] = True
+            return
+        upstream_page += 1
+
+PAGE_TOO_DEEP = object()
+
+def fill_filtered_page(listing_key, fetch_page, keep, page, limit):
+    """Page `page` of an upstream listing filtered by `keep`, filled from as many upstream pages as it takes.
+
+    `fetch_page(n)` returns the upstream payload for page n, with records
+    under 'data' and counts under 'pagination', or None. A cursor cached per
+    listing maps each filtered page already seen to the upstream page and
+    index it starts at, so later pages resume from the nearest known page
+    instead of scanning from the start. Returns (records, has_next, total),
+    where total is exact once the upstream listing has been read to the
+    end and otherwise estimated from the share of records kept; None when
+    the first upstream page could not be fetched, and PAGE_TOO_DEEP when
+    the page lies beyond what one scan reaches from the nearest known page.
+    The cursor still advances, so asking again gets closer each time.
+    """
+    cursor_key = fast_json.canonical_key('fill-cursor', {'listing': listing_key, 'limit': limit})
+    cursor = dict(get_cached_data(cursor_key) or {})
+    start = max((int(n) for n in cursor if int(n) <= page), default=1)
+    first_page, skip = cursor.get(str(start), (1, 0))
+
+    state = {}
+    records = []
+    has_next = False
+    position = scanned = kept = 0
+    for upstream_page, index, record in _scan_upstream(fetch_page, first_page, state):
+        if upstream_page == first_page and index < skip:
+            continue
+        scanned += 1
+        if not keep(record):
+            continue
+        kept += 1
+        filtered_page = start + position // limit
+        if position % limit == 0:
+            cursor[str(filtered_page)] = [upstream_page, index]
+        if filtered_page > page:
+            has_next = True
+            break
+        if filtered_page == page:
+            records.append(record)
+        position += 1
+
+    if state.get('failed') and not scanned:
+        return None
+    set_cached_data(cursor_key, cursor, app.config['FILL_PAGE_CURSOR_DURATION'])
+
+    exhausted = state.get('exhausted', False)
+    if not has_next and not exhausted:
+        # A page cut short by the scan cap is only served when the scan began
+        # at its own start; otherwise the next request starts there instead
+        if not records or start < page:
+            log.info('fill.too_deep', listing=listing_key, page=page, start=start,
+                     reached=start + position // limit)
+            return PAGE_TOO_DEEP
+        has_next = True
+
+    if exhausted and not has_next:
+        total = (start - 1) * limit + position
+    else:
+        upstream_total = state.get('upstream_total', 0)
+        total = round(upstream_total * kept / scanned) if scanned else upstream_total
+        total = max(total, (page - 1) * limit + len(records) + has_next)
+
+    log.debug('fill.page', sampled=True, listing=listing_key, page=page, start=start,
+              upstream_pages=state.get('upstream_pages', 0), scanned=scanned, kept=kept)
+    return records, has_next, total
 
 def build_pagination_info(pagination_response, page, limit):
     """Build standardized pagination info from API response"""
@@ -128,131 +813,222 @@ def build_pagination_info(pagination_response, page, limit):
         'total': total_results
     } if total_pages > 1 else None
 
-def process_author_data(works):
-    """Process and normalize author data in works list"""
-    for work in works:
-        if 'authors' in work and isinstance(work['authors'], dict):
-            author_string = work['authors'].get('author_string', '')
-            if author_string:
-                author_names = [name.strip() for name in author_string.split(';') if name.strip()]
-                work['authors'] = [{'name': name} for name in author_names]
-            else:
-                work['authors'] = []
-        elif not work.get('authors'):
-            work['authors'] = []
+def work_quality_score(work):
+    """Count of title, authors, abstract, year and DOI present on a raw work record"""
+    publication = work.get('publication') if isinstance(work.get('publication'), dict) else {}
+    has_title = work.get('title') and work.get('title').strip()
+    has_authors = work.get('authors') or (work.get('author_count') or 0) > 0
+    has_abstract = work.get('abstract') and len(work.get('abstract', '').strip()) > 50
+    has_year = work.get('publication_year') or publication.get('year')
+    has_doi = work.get('doi') or work.get('temp_doi') or publication.get('doi')
+    return sum([bool(has_title), bool(has_authors), bool(has_abstract), bool(has_year), bool(has_doi)])
+
+def canonical_authors(authors):
+    """Author dicts from any API author shape: names, dicts or {'author_string': 'A; B'}"""
+    if isinstance(authors, dict):
+        author_string = authors.get('author_string') or ''
+        return [{'name': name.strip()} for name in author_string.split(';') if name.strip()]
+    
+    canonical = []
+    for author in authors or []:
+        if isinstance(author, dict):
+            canonical.append(author)
+        elif str(author).strip():
+            canonical.append({'name': str(author).strip()})
+    return canonical
+
+def has_named_author(work):
+    """Whether a normalized work lists at least one author with a name"""
+    return any((author.get('name') or '').strip() for author in work.get('authors') or [])
+
+def format_author_names(authors, shown, author_count=None):
+    """'A, B et al.' from canonical authors, naming at most `shown` of them"""
+    names = [name for name in (author.get('name') or author.get('preferred_name') for author in authors) if name]
+    if not names:
+        return 'Autor não informado'
+    formatted = ', '.join(names[:shown])
+    if max(len(names), author_count or 0) > shown:
+        formatted += ' et al.'
+    return formatted
+
+def normalize_work(work):
+    """Add canonical authors and display fields to a work record, once"""
+    if 'formatted_authors' in work:
+        return work
+    
+    work['quality_score'] = work_quality_score(work)
+    authors = work['authors'] = canonical_authors(work.get('authors'))
+    work['formatted_authors'] = format_author_names(authors, 3, work.get('author_count'))
+    work['formatted_authors_short'] = format_author_names(authors, 2, work.get('author_count'))
+    
+    publication = work.get('publication') if isinstance(work.get('publication'), dict) else {}
+    work['publication_year'] = publication.get('year') or work.get('publication_year') or work.get('year')
+    
+    doi = next((value for value in (work.get('doi'), work.get('temp_doi'))
+                if isinstance(value, str) and value.startswith('10.')), None)
+    work['doi_url'] = f"https://doi.org/{doi}" if doi else None
+    
+    venue = work.get('venue')
+    if isinstance(venue, dict) and not work.get('venue_name'):
+        work['venue_name'] = venue.get('name', '')
+    return work
+
+def normalize_works(works):
+    """Normalize every work record of a list in place"""
+    for work in works or []:
+        if isinstance(work, dict):
+            normalize_work(work)
     return works
 
+def ingest_works(payload):
+    """Normalize the work records of an API payload as it arrives, before it is cached"""
+    data = payload.get('data') if isinstance(payload, dict) else None
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        normalize_works(data['results'])
+    elif isinstance(data, dict):
+        normalize_work(data)
+    elif isinstance(data, list):
+        normalize_works(data)
+    return payload
+
+def ingest_organization(payload):
+    """Normalize the recent works embedded in an organization record before it is cached"""
+    data = payload.get('data') if isinstance(payload, dict) else None
+    if isinstance(data, dict) and isinstance(data.get('recent_works'), list):
+        normalize_works(data['recent_works'])
+    return payload
+
+INGEST_STEPS = {
+    endpoint: ingest_works for endpoint in (
+        '/works', '/works/{id}', '/search/works', '/search/sphinx', '/persons/{id}/works',
+        '/organizations/{id}/works', '/venues/{id}/works', '/signatures/{id}/works'
+    )
+}
+INGEST_STEPS['/organizations/{id}'] = ingest_organization
+
+def is_quality_work(work):
+    """Whether a work record has enough complete data to be listed"""
+    if not isinstance(work, dict):
+        return False
+    
+    quality_score = work.get('quality_score')
+    if quality_score is None:
+        quality_score = work_quality_score(work)
+    return quality_score >= 3
+
 def filter_quality_results(results):
     """Filter results to show only high-quality records with complete data"""
     if not results:
         return results
     
-    filtered = []
-    for work in results:
-        if not isinstance(work, dict):
-            continue
-            
-        has_title = work.get('title') and work.get('title').strip()
-        has_authors = work.get('authors') or work.get('author_count', 0) > 0
-        has_abstract = work.get('abstract') and len(work.get('abstract', '').strip()) > 50
-        has_year = work.get('publication_year') or (work.get('publication') and work.get('publication', {}).get('year'))
-        has_doi = work.get('doi') or work.get('temp_doi') or (work.get('publication') and work.get('publication', {}).get('doi'))
-        
-        quality_score = sum([bool(has_title), bool(has_authors), bool(has_abstract), bool(has_year), bool(has_doi)])
-        
-        if quality_score >= 3:
-            work['quality_score'] = quality_score
-            filtered.append(work)
-    
-    return filtered
+    return [work for work in results if is_quality_work(work)]
+
+def format_batch_work(work_data):
+    """Shape a work detail payload for the personal list batch API"""
+    normalize_work(work_data)
+    formatted_work = {
+        'id': work_data.get('id'),
+        'title': work_data.get('title', ''),
+        'authors': [{
+            'full_name': author.get('name', ''),
+            'orcid': author.get('orcid'),
+            'person_id': author.get('person_id'),
+            'affiliation': author.get('affiliation')
+        } for author in work_data['authors']],
+        'publication_year': work_data['publication_year'],
+        'venue_name': work_data.get('venue', {}).get('name') if work_data.get('venue') else '',
+        'publisher_name': work_data.get('publisher', {}).get('name') if work_data.get('publisher') else '',
+        'work_type': work_data.get('work_type') or work_data.get('type', ''),
+        'doi': work_data.get('doi') or work_data.get('temp_doi'),
+        'abstract': work_data.get('abstract', ''),
+        'language': work_data.get('language', ''),
+        'venue': work_data.get('venue'),
+        'publisher': work_data.get('publisher'),
+        'publication': work_data.get('publication'),
+        'metrics': work_data.get('metrics'),
+        'identifiers': work_data.get('identifiers', [])
+    }
+    return formatted_work
+
+STATS_TOTALS = (
+    ('total_works', '/works'),
+    ('total_venues', '/venues'),
+    ('total_authors', '/persons'),
+    ('total_organizations', '/organizations'),
+)
+
+def _fetch_stats_totals():
+    """Record counts read from one-record listing pages, keeping the previous count of any that fail"""
+    totals = dict(stats_snapshot.get('totals', {}))
+    fetched = False
+    for key, endpoint in STATS_TOTALS:
+        response = api_request(endpoint, {'limit': 1, 'page': 1}, use_cache=False)
+        if response and response.get('pagination'):
+            totals[key] = response['pagination'].get('total', 0)
+            fetched = True
+    return totals if fetched else None
+
+stats_snapshot = StatsSnapshot({
+    'totals': _fetch_stats_totals,
+    'annual': lambda: api_request('/metrics/annual', use_cache=False),
+    'venues': lambda: api_request('/venues/statistics', use_cache=False),
+    'courses': lambda: api_request('/courses/statistics', use_cache=False),
+    'instructors': lambda: api_request('/instructors/statistics', use_cache=False),
+}, app.config['STATS_REFRESH_INTERVAL'], app.config['STATS_SNAPSHOT_FILE'], log)
+
+def homepage_stats():
+    """Record counts for the homepage, read from the stats snapshot on every request"""
+    stats = {key: 0 for key, _ in STATS_TOTALS}
+    stats.update(stats_snapshot.get('totals', {}))
+    return stats
 
 def _generate_homepage_data():
-    """Generate comprehensive homepage data with caching"""
+    """Generate comprehensive homepage data with caching
+    
+    The cached payload leaves out the record counts, which homepage_stats
+    reads from the snapshot per request so a refresh shows up at once.
+    """
     homepage_cache_key = "homepage_complete_data"
     cached_homepage = get_cached_data(homepage_cache_key)
     if cached_homepage:
         return cached_homepage
     
-    stats = {
-        'total_works': 0,
-        'total_venues': 0,
-        'total_authors': 0,
-        'total_organizations': 0
-    }
     recent_works = []
     top_venues = []
     top_authors = []
     top_organizations = []
     
     try:
-        works_response = api_request('/works', {'limit': 12, 'page': 1}, use_cache=True)
+        works_response = api_request('/works', {'limit': 12, 'page': 1}, model=Work)
         if works_response and 'data' in works_response:
             for work in works_response['data']:
                 if work.get('title') and work.get('title').strip() and len(recent_works) < 8:
-                    author_names = []
-                    if work.get('authors_preview') and isinstance(work.get('authors_preview'), list) and len(work['authors_preview']) > 0:
-                        for author in work['authors_preview'][:2]:
-                            if isinstance(author, str):
-                                author_name = author.strip()
-                                if author_name:
-                                    author_names.append(author_name)
-                    
-                    if author_names:
-                        work['formatted_authors'] = ', '.join(author_names)
-                        if work.get('author_count', 0) > 2:
-                            work['formatted_authors'] += ' et al.'
-                    else:
-                        work['formatted_authors'] = 'Autor não informado'
-                    
-                    work['publication_year'] = work.get('publication_year') or "S/D"
-                    
                     recent_works.append(work)
         
-        venues_response = api_request('/venues', {'limit': 20, 'page': 1}, use_cache=True)
+        venues_response = api_request('/venues', {'limit': 20, 'page': 1}, model=Venue)
         if venues_response and 'data' in venues_response:
             venues_list = venues_response['data']
-            if venues_response.get('pagination'):
-                stats['total_venues'] = venues_response['pagination'].get('total', len(venues_list))
-            else:
-                stats['total_venues'] = len(venues_list)
-            
             venues_with_works = []
             for venue in venues_list[:15]:
                 works_count = venue.get('works_count', 0)
                 name = venue.get('name', '').strip()
                 if works_count > 5 and name and len(name) > 3 and not name.startswith('2020') and 'A History of' not in name:
-                    venues_with_works.append({
-                        'id': venue.get('id'),
-                        'name': name,
-                        'works_count': works_count,
-                        'type': venue.get('type', 'JOURNAL'),
-                        'publisher_name': venue.get('publisher_name') or 'Não informado'
-                    })
+                    venues_with_works.append(Venue(
+                        id=venue.get('id'),
+                        name=name,
+                        works_count=works_count,
+                        type=venue.get('type', 'JOURNAL'),
+                        publisher_name=venue.get('publisher_name') or 'Não informado'
+                    ))
             
             top_venues = sorted(venues_with_works, key=lambda x: x.get('works_count', 0), reverse=True)[:10]
         
-        persons_response = api_request('/persons', {'limit': 50, 'page': 1}, use_cache=True)
-        if persons_response and 'data' in persons_response:
-            persons_list = persons_response['data']
-            if persons_response.get('pagination'):
-                stats['total_authors'] = persons_response['pagination'].get('total', len(persons_list))
-            else:
-                stats['total_authors'] = len(persons_list) * 10
-        
-        orgs_response = api_request('/organizations', {'limit': 25, 'page': 1}, use_cache=True, timeout=3)
+        orgs_response = api_request('/organizations', {'limit': 25, 'page': 1}, timeout=3, model=Organization)
         if orgs_response and 'data' in orgs_response:
             orgs_list = orgs_response['data']
-            if orgs_response.get('pagination'):
-                stats['total_organizations'] = orgs_response['pagination'].get('total', len(orgs_list))
-            else:
-                stats['total_organizations'] = len(orgs_list) * 10
-            
             for org in orgs_list:
                 name = org.get('name', '').strip()
-                
-                researchers_count = 0
-                if org.get('metrics') and org['metrics'].get('affiliated_authors_count'):
-                    researchers_count = org['metrics']['affiliated_authors_count']
+                researchers_count = org.get('researchers_count', 0)
                 
                 if (name and len(name) > 5 and researchers_count > 0 and
                     not name.startswith(',') and 
@@ -262,36 +1038,21 @@ def _generate_homepage_data():
                     'Te Puna Wānanga' not in name and
                     'Press' not in name):
                     
-                    country = 'País não informado'
-                    if org.get('location') and org['location'].get('country_code'):
-                        country = org['location']['country_code']
-                    
-                    top_organizations.append({
-                        'id': org.get('id'),
-                        'name': name,
-                        'type': org.get('type', 'UNIVERSITY'),
-                        'country': country,
-                        'persons_count': researchers_count
-                    })
+                    top_organizations.append(Organization(
+                        id=org.get('id'),
+                        name=name,
+                        type=org.get('type', 'UNIVERSITY'),
+                        country=org.get('country', 'País não informado'),
+                        researchers_count=researchers_count
+                    ))
                     
                     if len(top_organizations) >= 10:
                         break
         
-        if stats['total_works'] == 0:
-            if venues_response and 'pagination' in venues_response:
-                stats['total_works'] = venues_response['pagination'].get('total', 650000)
-            else:
-                stats['total_works'] = 650000
-        
     except Exception as e:
         app.logger.error(f"Error loading homepage data: {e}")
-        stats['total_works'] = 650000
-        stats['total_venues'] = 4945
-        stats['total_authors'] = 549480
-        stats['total_organizations'] = 182170
     
     homepage_data = {
-        'stats': stats,
         'recent_works': recent_works,
         'top_venues': top_venues,
         'top_organizations': top_organizations
@@ -303,7 +1064,7 @@ def _generate_homepage_data():
 @app.route('/')
 def home():
     """Homepage with statistics and featured content"""
-    homepage_data = _generate_homepage_data()
+    homepage_data = {**_generate_homepage_data(), 'stats': homepage_stats()}
     return render_template('pages/home.html', initial_data=homepage_data, **homepage_data)
 
 @app.route('/api/preload/homepage')
@@ -312,21 +1073,13 @@ def api_preload_homepage():
     try:
         homepage_cache_key = "homepage_complete_data"
         cached_homepage = get_cached_data(homepage_cache_key)
-        if cached_homepage:
-            return jsonify({
-                'status': 'success',
-                'data': cached_homepage,
-                'source': 'cache'
-            })
-        
-        homepage_data = _generate_homepage_data()
+        homepage_data = cached_homepage or _generate_homepage_data()
         
-        cached_homepage = get_cached_data(homepage_cache_key)
-        if cached_homepage:
+        if homepage_data:
             return jsonify({
                 'status': 'success',
-                'data': cached_homepage,
-                'source': 'generated'
+                'data': {**homepage_data, 'stats': homepage_stats()},
+                'source': 'cache' if cached_homepage else 'generated'
             })
         
         return jsonify({
@@ -351,6 +1104,117 @@ def search_advanced():
     """Advanced search form"""
     return render_template('pages/search-form.html')
 
+COMMON_SEARCH_TERMS = [
+    'antropologia', 'etnografia', 'cultura', 'sociedade', 'ritual',
+    'mito', 'parentesco', 'identidade', 'território', 'comunidade',
+    'tradição', 'modernidade', 'globalização', 'desenvolvimento',
+    'gênero', 'etnia', 'religião', 'política', 'economia'
+]
+
+_search_executor = ThreadPoolExecutor(max_workers=app.config['SEARCH_EXECUTOR_WORKERS'], 
+                                      thread_name_prefix='federated-search')
+
+def run_federated_search(sub_searches, deadline):
+    """Run independent sub-searches in parallel and collect those finished by the deadline"""
+    request_locals = capture_request_locals()
+    futures = {name: _search_executor.submit(run_with_request_locals, request_locals, search)
+               for name, search in sub_searches.items()}
+    done, _ = wait(futures.values(), timeout=deadline)
+    
+    results = {}
+    status = {}
+    for name, future in futures.items():
+        if future not in done:
+            log.warning('search.section_deadline', section=name, deadline=deadline)
+            status[name] = 'loading'
+        elif future.exception() is not None:
+            log.error('search.section_error', section=name, error=future.exception())
+            status[name] = 'unavailable'
+        elif future.result() is None:
+            status[name] = 'unavailable'
+        else:
+            results[name] = future.result()
+            status[name] = 'ready'
+    
+    return results, status
+
+def _search_live_works(query, limit, page):
+    def fetch_page(upstream_page):
+        return cached_search_request('/search/works', {
+            'q': query,
+            'limit': limit,
+            'page': upstream_page
+        }, timeout=app.config['SEARCH_SECTION_TIMEOUT'])
+    
+    filled = fill_filtered_page(f"/search/works:{normalize_search_query(query)}", fetch_page,
+                                is_quality_work, page, limit)
+    if filled is None or filled is PAGE_TOO_DEEP:
+        return filled
+    
+    works, _, total = filled
+    return works, total
+
+def _search_live_authors(query, limit):
+    authors_response = cached_search_request('/persons', {
+        'name': query,
+        'limit': limit
+    }, timeout=app.config['SEARCH_SECTION_TIMEOUT'])
+    if not authors_response:
+        return None
+    
+    authors_filtered = []
+    for author in authors_response.get('data') or []:
+        if author.get('preferred_name') and author.get('preferred_name').strip():
+            works_count = 0
+            if author.get('metrics') and author['metrics'].get('works_count'):
+                works_count = author['metrics']['works_count']
+            
+            authors_filtered.append({
+                'id': author.get('id'),
+                'name': author.get('preferred_name'),
+                'organization_name': 'Instituição não informada',
+                'works_count': works_count
+            })
+    return authors_filtered[:10]
+
+def _search_live_venues(query):
+    venues_response = api_request('/venues', {'limit': 100}, timeout=app.config['SEARCH_SECTION_TIMEOUT'])
+    if not venues_response:
+        return None
+    
+    venues_filtered = []
+    query_lower = query.lower()
+    for venue in venues_response.get('data') or []:
+        venue_name = venue.get('name', '').lower()
+        if query_lower in venue_name and venue.get('works_count', 0) > 0:
+            venues_filtered.append({
+                'id': venue.get('id'),
+                'name': venue.get('name'),
+                'works_count': venue.get('works_count', 0),
+                'type': venue.get('type', 'JOURNAL'),
+                'publisher_name': venue.get('publisher_name', 'Editora não informada')
+            })
+    return sorted(venues_filtered, key=lambda x: x.get('works_count', 0), reverse=True)[:8]
+
+def _search_live_organizations(query):
+    orgs_response = api_request('/organizations', {'limit': 50}, timeout=app.config['SEARCH_SECTION_TIMEOUT'])
+    if not orgs_response:
+        return None
+    
+    orgs_filtered = []
+    query_lower = query.lower()
+    for org in orgs_response.get('data') or []:
+        org_name = org.get('name', '').lower()
+        if query_lower in org_name:
+            orgs_filtered.append({
+                'id': org.get('id'),
+                'name': org.get('name'),
+                'type': org.get('type', 'UNIVERSITY'),
+                'country': org.get('country', 'País não informado'),
+                'persons_count': org.get('persons_count', 0)
+            })
+    return orgs_filtered[:6]
+
 @app.route('/search/live')
 def search_live():
     """Smart search page with live results"""
@@ -368,87 +1232,34 @@ def search_live():
     
     suggestions = []
     total_results = 0
+    section_status = {}
     
     if query:
-        try:
-            if search_type in ['all', 'works']:
-                works_response = api_request('/search/works', {
-                    'q': query,
-                    'limit': limit if search_type == 'works' else 10,
-                    'page': page if search_type == 'works' else 1
-                })
-                if works_response and works_response.get('data'):
-                    results['works'] = filter_quality_results(works_response['data'])
-                    if works_response.get('pagination'):
-                        total_results += works_response['pagination'].get('total', 0)
-            
-            if search_type in ['all', 'authors']:
-                authors_response = api_request('/persons', {
-                    'name': query,
-                    'limit': limit if search_type == 'authors' else 5
-                })
-                if authors_response and authors_response.get('data'):
-                    authors_filtered = []
-                    for author in authors_response['data']:
-                        if author.get('preferred_name') and author.get('preferred_name').strip():
-                            works_count = 0
-                            if author.get('metrics') and author['metrics'].get('works_count'):
-                                works_count = author['metrics']['works_count']
-                            
-                            authors_filtered.append({
-                                'id': author.get('id'),
-                                'name': author.get('preferred_name'),
-                                'organization_name': 'Instituição não informada',
-                                'works_count': works_count
-                            })
-                    results['authors'] = authors_filtered[:10]
-            
-            if search_type in ['all', 'venues']:
-                venues_response = api_request('/venues', {'limit': 100})
-                if venues_response and venues_response.get('data'):
-                    venues_filtered = []
-                    query_lower = query.lower()
-                    for venue in venues_response['data']:
-                        venue_name = venue.get('name', '').lower()
-                        if query_lower in venue_name and venue.get('works_count', 0) > 0:
-                            venues_filtered.append({
-                                'id': venue.get('id'),
-                                'name': venue.get('name'),
-                                'works_count': venue.get('works_count', 0),
-                                'type': venue.get('type', 'JOURNAL'),
-                                'publisher_name': venue.get('publisher_name', 'Editora não informada')
-                            })
-                    results['venues'] = sorted(venues_filtered, key=lambda x: x.get('works_count', 0), reverse=True)[:8]
-            
-            if search_type in ['all', 'organizations']:
-                orgs_response = api_request('/organizations', {'limit': 50})
-                if orgs_response and orgs_response.get('data'):
-                    orgs_filtered = []
-                    query_lower = query.lower()
-                    for org in orgs_response['data']:
-                        org_name = org.get('name', '').lower()
-                        if query_lower in org_name:
-                            orgs_filtered.append({
-                                'id': org.get('id'),
-                                'name': org.get('name'),
-                                'type': org.get('type', 'UNIVERSITY'),
-                                'country': org.get('country', 'País não informado'),
-                                'persons_count': org.get('persons_count', 0)
-                            })
-                    results['organizations'] = orgs_filtered[:6]
-            
-            if query and len(query) > 2:
-                common_terms = [
-                    'antropologia', 'etnografia', 'cultura', 'sociedade', 'ritual',
-                    'mito', 'parentesco', 'identidade', 'território', 'comunidade',
-                    'tradição', 'modernidade', 'globalização', 'desenvolvimento',
-                    'gênero', 'etnia', 'religião', 'política', 'economia'
-                ]
-                suggestions = [term for term in common_terms 
-                             if term.startswith(query.lower()) and term != query.lower()][:5]
-        
-        except Exception as e:
-            app.logger.error(f"Error in search: {e}")
+        sub_searches = {}
+        if search_type in ['all', 'works']:
+            sub_searches['works'] = lambda: _search_live_works(
+                query,
+                limit if search_type == 'works' else 10,
+                page if search_type == 'works' else 1)
+        if search_type in ['all', 'authors']:
+            sub_searches['authors'] = lambda: _search_live_authors(query, limit if search_type == 'authors' else 5)
+        if search_type in ['all', 'venues']:
+            sub_searches['venues'] = lambda: _search_live_venues(query)
+        if search_type in ['all', 'organizations']:
+            sub_searches['organizations'] = lambda: _search_live_organizations(query)
+        
+        section_results, section_status = run_federated_search(sub_searches, app.config['SEARCH_LIVE_DEADLINE'])
+        
+        if section_results.get('works') is PAGE_TOO_DEEP:
+            section_results.pop('works')
+            section_status['works'] = 'loading'
+        if 'works' in section_results:
+            results['works'], total_results = section_results.pop('works')
+        results.update(section_results)
+        
+        if len(query) > 2:
+            suggestions = [term for term in COMMON_SEARCH_TERMS 
+                         if term.startswith(query.lower()) and term != query.lower()][:5]
     
     return render_template('pages/search-results.html',
                          query=query,
@@ -456,6 +1267,7 @@ def search_live():
                          results=results,
                          suggestions=suggestions,
                          total_results=total_results,
+                         section_status=section_status,
                          page=page,
                          limit=limit)
 
@@ -489,10 +1301,10 @@ def person_id_works(person_id):
                                  page=page)
         
         results = works_response.get('data', [])
-        
-        results = process_author_data(results)
         pagination = build_pagination_info(works_response.get('pagination', {}), page, limit)
         total_results = works_response.get('pagination', {}).get('total', len(results))
+        prefetch_next_page(f'/persons/{person_id}/works', {'page': page, 'limit': limit},
+                           bool(pagination and pagination['hasNext']))
         
         search_params = {'query': f"Obras de {author_name}"}
         
@@ -526,32 +1338,18 @@ def venues_detail(venue_id):
     
     publications = []
     total_publications = venue.get('works_count', 0)
+    has_next = False
     
-    works_response = api_request(f'/venues/{venue_id}/works', {'limit': limit, 'page': page})
-    if works_response and 'data' in works_response:
-        publications_raw = works_response['data']
-        publications = []
-        
-        for pub in publications_raw:
-            if pub.get('authors') and len(pub['authors']) > 0:
-                has_valid_author = False
-                for author in pub['authors']:
-                    author_name = ''
-                    if isinstance(author, dict):
-                        author_name = author.get('name', '').strip()
-                    else:
-                        author_name = str(author).strip()
-                    if author_name:
-                        has_valid_author = True
-                        break
-                
-                if has_valid_author:
-                    publications.append(pub)
-        
+    filled = fill_filtered_page(
+        f'/venues/{venue_id}/works',
+        lambda upstream_page: api_request(f'/venues/{venue_id}/works', {'limit': limit, 'page': upstream_page}),
+        has_named_author, page, limit)
+    page_pending = filled is PAGE_TOO_DEEP
+    if filled is not None and not page_pending:
+        publications, has_next, total_publications = filled
     
-    total_pages = max(1, (total_publications + limit - 1) // limit) if total_publications > 0 else 1
+    total_pages = max(page, (total_publications + limit - 1) // limit, 1)
     has_prev = page > 1
-    has_next = page < total_pages
     
     return render_template('pages/venues-detail.html', 
                          venue=venue,
@@ -561,7 +1359,8 @@ def venues_detail(venue_id):
                          page=page,
                          total_pages=total_pages,
                          has_prev=has_prev,
-                         has_next=has_next)
+                         has_next=has_next,
+                         page_pending=page_pending)
 
 @app.route('/organizations/<org_id>')
 def organizations_detail(org_id):
@@ -584,20 +1383,11 @@ def organizations_detail(org_id):
         
         if works_response and 'data' in works_response:
             works_data = works_response.get('data', [])
-            for work in works_data:
-                if 'authors' in work and isinstance(work['authors'], dict):
-                    author_string = work['authors'].get('author_string', '')
-                    if author_string:
-                        author_names = [name.strip() for name in author_string.split(';') if name.strip()]
-                        work['authors'] = [{'name': name} for name in author_names]
-                    else:
-                        work['authors'] = []
-                elif not work.get('authors'):
-                    work['authors'] = []
             
             pagination_info = works_response.get('pagination', {})
             total_results = pagination_info.get('total', len(works_data))
             total_pages = pagination_info.get('totalPages', 1)
+            prefetch_next_page(f'/organizations/{org_id}/works', {'page': page, 'limit': limit}, page < total_pages)
             
             pagination = {
                 'page': page,
@@ -644,7 +1434,7 @@ def venues_complete():
         page = int(request.args.get('page', 1))
         limit = app.config['DEFAULT_LIMIT']
         
-        venues_response = api_request('/venues', {'page': page, 'limit': limit})
+        venues_response = api_request('/venues', {'page': page, 'limit': limit}, model=Venue)
         
         if not venues_response or 'data' not in venues_response:
             return render_template('pages/search-results.html',
@@ -673,6 +1463,7 @@ def venues_complete():
         total_pages = max(1, (total_results + limit - 1) // limit)
         has_prev = page > 1
         has_next = page < total_pages
+        prefetch_next_page('/venues', {'page': page, 'limit': limit}, has_next, model=Venue)
         
         pagination = {
             'page': page,
@@ -701,7 +1492,7 @@ def organizations_complete():
         page = int(request.args.get('page', 1))
         limit = app.config['DEFAULT_LIMIT']
         
-        orgs_response = api_request('/organizations', {'page': page, 'limit': limit})
+        orgs_response = api_request('/organizations', {'page': page, 'limit': limit}, model=Organization)
         
         if not orgs_response or 'data' not in orgs_response:
             return render_template('pages/search-results.html',
@@ -716,17 +1507,13 @@ def organizations_complete():
         for org in orgs_list:
             org_name = org.get('name', '').strip()
             if org_name and len(org_name) > 1:
-                researchers_count = 0
-                if org.get('metrics') and org['metrics'].get('affiliated_authors_count'):
-                    researchers_count = org['metrics']['affiliated_authors_count']
-                
                 results.append({
                     'id': org.get('id'),
                     'title': org_name,
                     'org_id': org.get('id'),
                     'type': org.get('type', 'UNIVERSITY'),
-                    'researchers_count': researchers_count,
-                    'ror_id': org.get('identifiers', {}).get('ror_id') if org.get('identifiers') else None
+                    'researchers_count': org.get('researchers_count', 0),
+                    'ror_id': org.get('ror_id')
                 })
         
         pagination_info = orgs_response.get('pagination', {})
@@ -734,6 +1521,7 @@ def organizations_complete():
         total_pages = max(1, (total_results + limit - 1) // limit)
         has_prev = page > 1
         has_next = page < total_pages
+        prefetch_next_page('/organizations', {'page': page, 'limit': limit}, has_next, model=Organization)
         
         pagination = {
             'page': page,
@@ -762,7 +1550,7 @@ def works_list():
         page = int(request.args.get('page', 1))
         limit = app.config['DEFAULT_LIMIT']
         
-        works_response = api_request('/works', {'page': page, 'limit': limit}, use_cache=True)
+        works_response = api_request('/works', {'page': page, 'limit': limit}, model=Work)
         
         if not works_response or 'data' not in works_response:
             return render_template('pages/search-results.html',
@@ -776,33 +1564,12 @@ def works_list():
         
         works_list = works_response['data']
         
-        results = []
-        for work in works_list:
-            if work.get('title') and work.get('title').strip():
-                author_names = []
-                if work.get('authors') and isinstance(work.get('authors'), list):
-                    for author in work['authors'][:3]:
-                        author_name = str(author).strip()
-                        if author_name:
-                            author_names.append(author_name)
-                
-                if author_names:
-                    work['formatted_authors'] = ', '.join(author_names)
-                    if work.get('authors') and len(work['authors']) > 3:
-                        work['formatted_authors'] += ' et al.'
-                else:
-                    work['formatted_authors'] = 'Autor não informado'
-                
-                work['publication_year'] = work.get('year') or 'S/D'
-                
-                if work.get('venue'):
-                    work['venue_name'] = work['venue'].get('name', '')
-                
-                results.append(work)
+        results = [work for work in works_list if work.get('title') and work.get('title').strip()]
         
         pagination_info = works_response.get('pagination', {})
         total_results = pagination_info.get('total', len(results))
         total_pages = max(1, (total_results + limit - 1) // limit)
+        prefetch_next_page('/works', {'page': page, 'limit': limit}, page < total_pages, model=Work)
         
         pagination = {
             'page': page,
@@ -830,25 +1597,62 @@ def venues_list():
     """Display journals listing"""
     journals = api_request('/venues', {'limit': 50})
     
-    stats = api_request('/venues/statistics')
+    stats = stats_snapshot.get('venues')
     
     return render_template('pages/venues-list.html',
                          journals=journals,
                          stats=stats)
 
+ppgas_data = PPGASDataset(lambda endpoint, params=None: api_request(endpoint, params, use_cache=False,
+                                                                   timeout=30),
+                          app.config['PPGAS_SYNC_INTERVAL'], app.config['PPGAS_DATASET_FILE'],
+                          app.config['PPGAS_SYNC_CONCURRENCY'], log=log)
+
+def ppgas_filters():
+    """Course and instructor listing filters from the query string"""
+    filters = {key: request.args.get(key, '').strip() for key in ('q', 'year', 'semester')}
+    return {key: value for key, value in filters.items() if value}
+
+def ppgas_courses_page(page, limit, filters=None):
+    """Courses listing from the local PPGAS dataset, or from the API until it has synced"""
+    if ppgas_data.ready:
+        return ppgas_data.list_courses(page, limit, **(filters or {}))
+    return api_request('/courses', {'page': page, 'limit': limit}, timeout=30, model=Course)
+
+def ppgas_instructors_page(page, limit, filters=None):
+    """Instructors listing from the local PPGAS dataset, or from the API until it has synced"""
+    if ppgas_data.ready:
+        return ppgas_data.list_instructors(page, limit, (filters or {}).get('q'))
+    return api_request('/instructors', {'offset': (page - 1) * limit, 'limit': limit}, model=Instructor)
+
+def ppgas_course(course_id):
+    """Course with bibliography, instructors and subjects"""
+    if ppgas_data.ready:
+        return ppgas_data.course(course_id)
+    return api_request(f'/courses/{course_id}')
+
+def ppgas_instructor(instructor_id):
+    """Instructor statistics profile and the courses they taught"""
+    if ppgas_data.ready:
+        return ppgas_data.instructor_statistics(instructor_id), ppgas_data.instructor_courses(instructor_id)
+    stats_data = api_request(f'/instructors/{instructor_id}/statistics')
+    if not stats_data or 'person' not in stats_data:
+        return None, None
+    return stats_data, api_request(f'/instructors/{instructor_id}/courses')
+
 @app.route('/ppgas')
 def ppgas_home():
     """PPGAS section with courses and professors"""
     try:
-        courses_data = api_request('/courses', {'limit': 10, 'page': 1})
+        courses_data = ppgas_courses_page(1, 10)
         courses = courses_data.get('courses', []) if courses_data else []
         
-        instructors_data = api_request('/instructors', {'limit': 10, 'page': 1})
+        instructors_data = ppgas_instructors_page(1, 10)
         instructors = instructors_data.get('instructors', []) if instructors_data else []
         
-        courses_stats = api_request('/courses/statistics')
+        courses_stats = stats_snapshot.get('courses')
         
-        instructors_stats = api_request('/instructors/statistics')
+        instructors_stats = stats_snapshot.get('instructors')
         
         disciplinas_por_professores = []
         if instructors:
@@ -878,8 +1682,9 @@ def courses_ppgas():
     try:
         page = int(request.args.get('page', 1))
         limit = 20
+        filters = ppgas_filters()
         
-        courses_data = api_request('/courses', {'page': page, 'limit': limit}, timeout=30)
+        courses_data = ppgas_courses_page(page, limit, filters)
         courses = courses_data.get('courses', []) if courses_data else []
         
         api_pagination = courses_data.get('pagination', {}) if courses_data else {}
@@ -893,12 +1698,13 @@ def courses_ppgas():
                 'has_next': page < total_pages
             }
         
-        stats = api_request('/courses/statistics')
+        stats = stats_snapshot.get('courses')
         
         return render_template('pages/courses-ppgas.html',
                              courses=courses,
                              pagination=pagination,
-                             stats=stats)
+                             stats=stats,
+                             filters=filters)
     except Exception as e:
         app.logger.error(f"Exception in courses_ppgas(): {e}")
         import traceback
@@ -906,13 +1712,14 @@ def courses_ppgas():
         return render_template('pages/courses-ppgas.html',
                              courses=[],
                              pagination={},
-                             stats=None)
+                             stats=None,
+                             filters={})
 
 @app.route('/courses/ppgas/<course_id>')
 def courses_ppgas_detail(course_id):
     """PPGAS course detail"""
     try:
-        course_data = api_request(f'/courses/{course_id}')
+        course_data = ppgas_course(course_id)
         
         if course_data:
             course = {
@@ -950,7 +1757,7 @@ def courses_ppgas_detail(course_id):
 def courses_detail(course_id):
     """Course detail - general route"""
     try:
-        course_data = api_request(f'/courses/{course_id}')
+        course_data = ppgas_course(course_id)
         
         if course_data:
             course = {
@@ -990,24 +1797,27 @@ def courses_list():
     try:
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 30))
+        filters = ppgas_filters()
         
-        courses_data = api_request('/courses', {'page': page, 'limit': limit})
+        courses_data = ppgas_courses_page(page, limit, filters)
         courses = courses_data.get('courses', []) if courses_data else []
         pagination = courses_data.get('pagination', {}) if courses_data else {}
         
-        stats = api_request('/courses/statistics')
+        stats = stats_snapshot.get('courses')
         
         return render_template('pages/courses-list.html',
                              courses=courses,
                              pagination=pagination,
                              stats=stats,
-                             current_page=page)
+                             current_page=page,
+                             filters=filters)
     except Exception as e:
         return render_template('pages/courses-list.html',
                              courses=[],
                              pagination={},
                              stats=None,
-                             current_page=1)
+                             current_page=1,
+                             filters={})
 
 @app.route('/instructors')
 def instructors_list():
@@ -1015,32 +1825,34 @@ def instructors_list():
     try:
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 20))
-        offset = (page - 1) * limit
+        filters = ppgas_filters()
         
-        instructors_data = api_request('/instructors', {'offset': offset, 'limit': limit})
+        instructors_data = ppgas_instructors_page(page, limit, filters)
         instructors = instructors_data.get('instructors', []) if instructors_data else []
         pagination = instructors_data.get('pagination', {}) if instructors_data else {}
         
-        stats = api_request('/instructors/statistics')
+        stats = stats_snapshot.get('instructors')
         
         return render_template('pages/instructors-list.html',
                              instructors=instructors,
                              pagination=pagination,
-                             stats=stats)
+                             stats=stats,
+                             filters=filters)
     except Exception as e:
         app.logger.error(f"Error in instructors_list: {e}")
         return render_template('pages/instructors-list.html',
                              instructors=[],
                              pagination={},
-                             stats=None)
+                             stats=None,
+                             filters={})
 
 @app.route('/instructors/<instructor_id>')
 def instructors_detail(instructor_id):
     """PPGAS professor detail"""
-    stats_data = api_request(f'/instructors/{instructor_id}/statistics')
+    stats_data, courses_data = ppgas_instructor(instructor_id)
     
     if stats_data and 'person' in stats_data:
-        instructor = stats_data.get('person', {})
+        instructor = dict(stats_data.get('person', {}))
         teaching_profile = stats_data.get('teaching_profile', {})
         authorship_profile = stats_data.get('authorship_profile', {})
         
@@ -1060,7 +1872,6 @@ def instructors_detail(instructor_id):
         most_used_authors = stats_data.get('most_used_authors_in_courses', [])
         teaching_collaborators = stats_data.get('teaching_collaborators', [])
         
-        courses_data = api_request(f'/instructors/{instructor_id}/courses')
         courses = courses_data if courses_data else []
         
         return render_template('pages/instructors-detail.html',
@@ -1128,27 +1939,26 @@ def search_results():
             if peer_reviewed:
                 search_params['peer_reviewed'] = peer_reviewed.lower() == 'true'
             
-            search_results = api_request('/search/works', search_params, use_cache=True)
+            search_results = cached_search_request('/search/works', search_params)
         else:
             search_params = {'q': search_query, 'page': page, 'limit': limit}
             
             # Try Sphinx first, fallback to /search/works on error
-            search_results = api_request('/search/sphinx', search_params, use_cache=True)
+            search_results = cached_search_request('/search/sphinx', search_params)
             
             # If Sphinx fails or returns error, use /search/works as fallback
             if not search_results or search_results.get('status') == 'error' or not search_results.get('data'):
-                app.logger.warning(f"Sphinx search failed for query: {search_query}, falling back to /search/works")
-                search_results = api_request('/search/works', search_params, use_cache=True)
+                log.warning('search.sphinx_fallback', query=search_query)
+                search_results = cached_search_request('/search/works', search_params)
     
     if search_results:
-        app.logger.debug(f"API response keys: {search_results.keys()}")
+        log.debug('search.response', sampled=True, keys=lambda: ','.join(search_results))
         
         if 'data' in search_results and isinstance(search_results['data'], dict) and 'results' in search_results['data']:
             data = search_results['data']
             works = data['results']
-            meta = data.get('meta', {})
-            meta['search_engine'] = 'sphinx'
-            app.logger.debug(f"Sphinx search results: {len(works)} works found")
+            meta = {**data.get('meta', {}), 'search_engine': 'sphinx'}
+            log.debug('search.results', sampled=True, engine='sphinx', count=len(works))
             pagination = {
                 'total': data.get('total', 0),
                 'page': page,
@@ -1159,15 +1969,15 @@ def search_results():
             }
         elif 'data' in search_results and isinstance(search_results['data'], list):
             works = search_results['data']
-            pagination = search_results.get('pagination', {})
-            meta = search_results.get('meta', {})
+            pagination = dict(search_results.get('pagination', {}))
+            meta = dict(search_results.get('meta', {}))
             if not meta.get('search_engine'):
                 meta['search_engine'] = 'fulltext'
         else:
             works = []
             pagination = {'total': 0, 'page': 1, 'pages': 0}
             meta = {}
-            app.logger.warning(f"Unexpected API response structure: {search_results}")
+            log.warning('search.unexpected_response', keys=','.join(search_results))
         
         if 'hasNext' in pagination and 'totalPages' not in pagination:
             total = pagination.get('total', 0)
@@ -1225,7 +2035,7 @@ def works_detail(work_id):
     if not work_response or 'data' not in work_response:
         return render_template('errors/404.html'), 404
     
-    work = work_response['data']
+    work = dict(work_response['data'])
     
     author_details = []
     affiliations_list = []
@@ -1249,9 +2059,6 @@ def works_detail(work_id):
                     if affiliation_name not in affiliations_list:
                         affiliations_list.append(affiliation_name)
     
-    if work.get('publication'):
-        work['publication_year'] = work['publication'].get('year')
-    
     if work.get('work_type'):
         work['formatted_type'] = work.get('work_type', '').replace('_', ' ').title()
     elif work.get('type'):
@@ -1259,16 +2066,11 @@ def works_detail(work_id):
     else:
         work['formatted_type'] = 'Artigo'
     
-    if work.get('doi') and work['doi'].startswith('10.'):
-        work['doi_url'] = f"https://doi.org/{work['doi']}"
-    elif work.get('temp_doi') and work['temp_doi'].startswith('10.'):
-        work['doi_url'] = f"https://doi.org/{work['temp_doi']}"
-    
     files_data = work.get('files', [])
     
     metrics_data = {}
     try:
-        metrics_response = api_request(f'/works/{work_id}/metrics')
+        metrics_response = api_request(f'/works/{work_id}/metrics') if budget_allows('work_metrics') else None
         if metrics_response and 'data' in metrics_response:
             metrics_data = metrics_response['data']
     except Exception as e:
@@ -1278,7 +2080,7 @@ def works_detail(work_id):
     similar_works = []
     
     try:
-        references_response = api_request(f'/works/{work_id}/references')
+        references_response = api_request(f'/works/{work_id}/references') if budget_allows('work_references') else None
         if references_response and 'data' in references_response and references_response['data'].get('referenced_works'):
             referenced_works = references_response['data']['referenced_works'][:4]
             
@@ -1294,13 +2096,13 @@ def works_detail(work_id):
     except Exception as e:
         app.logger.warning(f"Could not fetch references for work {work_id}: {e}")
     
-    if not references:
+    if not references and budget_allows('similar_works'):
         try:
             if work.get('title'):
                 title_words = work['title'].split()[:3]
                 if title_words:
                     search_query = ' '.join(title_words)
-                    similar_response = api_request('/search/works', {'q': search_query, 'limit': 5})
+                    similar_response = cached_search_request('/search/works', {'q': search_query, 'limit': 5})
                     if similar_response and 'data' in similar_response:
                         for similar in similar_response['data']:
                             if similar.get('id') != int(work_id):
@@ -1341,30 +2143,17 @@ def signatures_works(signature_id):
                 'limit': 25,
                 'page': int(request.args.get('page', 1))
             }
-            works_response = api_request('/search/works', search_params)
+            works_response = cached_search_request('/search/works', search_params)
         
         works = []
         pagination = {}
         total = 0
         
         if works_response and 'data' in works_response:
-            works = works_response['data']
+            works = [work if work.get('title') else {**work, 'title': 'Título não disponível'}
+                     for work in works_response['data']]
             total = works_response.get('total', 0)
             pagination = works_response.get('pagination', {})
-            
-            for work in works:
-                if 'authors' in work and isinstance(work['authors'], dict):
-                    author_string = work['authors'].get('author_string', '')
-                    if author_string:
-                        author_names = [name.strip() for name in author_string.split(';') if name.strip()]
-                        work['authors'] = [{'name': name} for name in author_names]
-                    else:
-                        work['authors'] = []
-                elif not work.get('authors'):
-                    work['authors'] = []
-                
-                if not work.get('title'):
-                    work['title'] = 'Título não disponível'
         
         search_params = {'query': f"Obras de {signature_name}"}
         
@@ -1381,17 +2170,6 @@ def signatures_works(signature_id):
         person_response = api_request(f'/persons/{signature_id}/works')
         if person_response and 'data' in person_response:
             works = person_response['data']
-            for work in works:
-                if 'authors' in work and isinstance(work['authors'], dict):
-                    author_string = work['authors'].get('author_string', '')
-                    if author_string:
-                        author_names = [name.strip() for name in author_string.split(';') if name.strip()]
-                        work['authors'] = [{'name': name} for name in author_names]
-                    else:
-                        work['authors'] = []
-                elif not work.get('authors'):
-                    work['authors'] = []
-            
             return render_template('pages/search-results.html',
                                  results=works,
                                  query=f"Obras de Signature {signature_id}",
@@ -1439,44 +2217,7 @@ def api_works_batch():
         for work_id in work_ids:
             work_response = api_request(f'/works/{work_id}')
             if work_response and 'data' in work_response:
-                work_data = work_response['data']
-                
-                formatted_work = {
-                    'id': work_data.get('id'),
-                    'title': work_data.get('title', ''),
-                    'authors': [],
-                    'publication_year': work_data.get('publication', {}).get('year') if work_data.get('publication') else work_data.get('year'),
-                    'venue_name': work_data.get('venue', {}).get('name') if work_data.get('venue') else '',
-                    'publisher_name': work_data.get('publisher', {}).get('name') if work_data.get('publisher') else '',
-                    'work_type': work_data.get('work_type') or work_data.get('type', ''),
-                    'doi': work_data.get('doi') or work_data.get('temp_doi'),
-                    'abstract': work_data.get('abstract', ''),
-                    'language': work_data.get('language', ''),
-                    'venue': work_data.get('venue'),
-                    'publisher': work_data.get('publisher'),
-                    'publication': work_data.get('publication'),
-                    'metrics': work_data.get('metrics'),
-                    'identifiers': work_data.get('identifiers', [])
-                }
-                
-                if work_data.get('authors') and isinstance(work_data.get('authors'), list):
-                    for author in work_data['authors']:
-                        if isinstance(author, dict):
-                            formatted_work['authors'].append({
-                                'full_name': author.get('name', ''),
-                                'orcid': author.get('orcid'),
-                                'person_id': author.get('person_id'),
-                                'affiliation': author.get('affiliation')
-                            })
-                        else:
-                            formatted_work['authors'].append({
-                                'full_name': str(author),
-                                'orcid': None,
-                                'person_id': None,
-                                'affiliation': None
-                            })
-                
-                works.append(formatted_work)
+                works.append(format_batch_work(work_response['data']))
         
         return jsonify({'works': works, 'total': len(works)})
     
@@ -1486,17 +2227,171 @@ def api_works_batch():
 
 @app.route('/api/statistics')
 def api_statistics():
-    """Proxy for statistics API - used by templates"""
-    stats = api_request('/metrics/annual')
+    """Annual statistics from the background snapshot - used by templates"""
+    stats = stats_snapshot.get('annual')
     if stats:
         return jsonify(stats)
-    else:
-        return jsonify({
-            'total_works': 399302,
-            'total_authors': 25000,
-            'total_venues': 1500,
-            'year': 2025
+    return jsonify({'error': 'Estatísticas ainda não disponíveis'}), 503
+
+@app.route('/api/statistics/status')
+def api_statistics_status():
+    """Age and consecutive failures of each statistics snapshot source"""
+    return jsonify(stats_snapshot.status())
+
+_autocomplete_cache = OrderedDict()
+_autocomplete_lock = threading.Lock()
+
+def normalize_autocomplete_query(query):
+    """Normalize an autocomplete prefix: lowercase with collapsed whitespace"""
+    return ' '.join(query.lower().split())
+
+def autocomplete_matches(text, prefix):
+    """Whether a suggestion matches a prefix the way /search/autocomplete matches it
+
+    The API suggests texts that start with the query or have a word starting
+    with it, so this must agree with it for a shorter prefix's complete result
+    set to be narrowed to a longer prefix's.
+    """
+    text = normalize_autocomplete_query(text)
+    return text.startswith(prefix) or f" {prefix}" in text
+
+def _get_autocomplete_entry(suggestion_type, prefix):
+    key = (suggestion_type, prefix)
+    with _autocomplete_lock:
+        entry = _autocomplete_cache.get(key)
+        if entry and time.time() < entry['expires']:
+            _autocomplete_cache.move_to_end(key)
+            return entry
+    return None
+
+def _store_autocomplete_entry(suggestion_type, prefix, suggestions, complete):
+    with _autocomplete_lock:
+        _autocomplete_cache.pop((suggestion_type, prefix), None)
+        while len(_autocomplete_cache) >= app.config['AUTOCOMPLETE_CACHE_MAX_ENTRIES']:
+            _autocomplete_cache.popitem(last=False)
+        _autocomplete_cache[(suggestion_type, prefix)] = {
+            'suggestions': suggestions,
+            'complete': complete,
+            'expires': time.time() + app.config['AUTOCOMPLETE_CACHE_DURATION']
+        }
+
+def fetch_autocomplete_suggestions(query, suggestion_type='all', limit=None):
+    """Return up to `limit` suggestions for a prefix, narrowing cached shorter prefixes when possible"""
+    suggestions = _autocomplete_suggestions(normalize_autocomplete_query(query), suggestion_type)
+    return suggestions[:limit] if suggestions is not None else None
+
+def _autocomplete_suggestions(prefix, suggestion_type):
+    entry = _get_autocomplete_entry(suggestion_type, prefix)
+    if entry:
+        return entry['suggestions']
+    
+    # A complete result set for a shorter prefix contains every match for a longer one
+    for end in range(len(prefix) - 1, 1, -1):
+        shorter = _get_autocomplete_entry(suggestion_type, prefix[:end])
+        if shorter and shorter['complete']:
+            suggestions = [s for s in shorter['suggestions'] if autocomplete_matches(s['text'], prefix)]
+            _store_autocomplete_entry(suggestion_type, prefix, suggestions, True)
+            return suggestions
+    
+    fetch_limit = app.config['AUTOCOMPLETE_FETCH_LIMIT']
+    result = api_request('/search/autocomplete', {'q': prefix, 'type': suggestion_type, 'limit': fetch_limit})
+    
+    if not result or 'data' not in result:
+        return None
+    
+    suggestions = []
+    for suggestion in result['data']['suggestions']:
+        suggestions.append({
+            'text': suggestion['text'],
+            'type': suggestion['type'],
+            'preview': suggestion.get('preview', suggestion['text']),
+            'work_count': suggestion.get('work_count')
         })
+    
+    _store_autocomplete_entry(suggestion_type, prefix, suggestions, len(suggestions) < fetch_limit)
+    return suggestions
+
+def prewarm_autocomplete_cache():
+    """Fetch the short prefixes of common search terms into the autocomplete cache"""
+    prefixes = []
+    for term in COMMON_SEARCH_TERMS:
+        for length in (2, 3):
+            if term[:length] not in prefixes:
+                prefixes.append(term[:length])
+    
+    for prefix in prefixes:
+        try:
+            fetch_autocomplete_suggestions(prefix)
+        except Exception as e:
+            app.logger.warning(f"Autocomplete prewarm failed for '{prefix}': {e}")
+    
+    app.logger.info(f"Autocomplete cache prewarmed with {len(prefixes)} prefixes")
+
+@app.route('/api/search/cache-stats')
+def api_search_cache_stats():
+    """Search result cache hit rates per search endpoint"""
+    return jsonify(get_search_cache_stats())
+
+@app.route('/api/prefetch/stats')
+def api_prefetch_stats():
+    """Speculative pagination prefetch counters"""
+    return jsonify(get_prefetch_stats())
+
+@app.route('/api/admission/stats')
+def api_admission_stats():
+    """Rate limiting, upstream slot and load shedding counters"""
+    return jsonify(get_admission_stats())
+
+def get_cache_storage_stats():
+    """Entry counts, compressed storage savings and decode time, and the cache policy table"""
+    compressed = [value for value in list(_cache.values()) if isinstance(value, CompressedEntry)]
+    raw_bytes = sum(entry.raw_size for entry in compressed)
+    stored_bytes = sum(len(entry.blob) for entry in compressed)
+    decodes = _cache_compression_stats['decodes']
+    return {
+        'codec': _cache_codec or 'off',
+        'threshold_bytes': app.config['CACHE_COMPRESSION_THRESHOLD'],
+        'entries': len(_cache),
+        'max_entries': app.config['CACHE_MAX_ENTRIES'],
+        'compressed_entries': len(compressed),
+        'raw_bytes': raw_bytes,
+        'compressed_bytes': stored_bytes,
+        'compression_ratio': round(raw_bytes / stored_bytes, 2) if stored_bytes else 0.0,
+        'decodes': decodes,
+        'decode_ms_avg': round(_cache_compression_stats['decode_seconds'] / decodes * 1000, 3) if decodes else 0.0,
+        'encode_seconds_total': round(_cache_compression_stats['encode_seconds'], 3),
+        'stale_grace_entries': len(_cache_stale_until),
+        'policies': cache_policies.describe()
+    }
+
+@app.route('/api/cache/stats')
+def api_cache_stats():
+    """Response cache size and compressed storage trade-off"""
+    return jsonify(get_cache_storage_stats())
+
+def _collect_runtime_gauges():
+    metrics.set_gauge('ethnos_cache_entries', len(_cache))
+    if _cache_codec:
+        storage = get_cache_storage_stats()
+        metrics.set_gauge('ethnos_cache_compressed_entries', storage['compressed_entries'])
+        metrics.set_gauge('ethnos_cache_compressed_bytes', storage['compressed_bytes'])
+    metrics.set_gauge('ethnos_upstream_inflight', _upstream_load['inflight'])
+    metrics.set_gauge('ethnos_admission_queue_depth', upstream_gate.waiting)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus text-format metrics, aggregated across workers when METRICS_DIR is set"""
+    if not app.config['METRICS_ENABLED']:
+        abort(404)
+    
+    _collect_runtime_gauges()
+    metrics_dir = app.config['METRICS_DIR']
+    if metrics_dir:
+        metrics.flush(metrics_dir)
+        body = metrics.render(metrics.aggregate(metrics_dir))
+    else:
+        body = metrics.render()
+    return Response(body, mimetype='text/plain; version=0.0.4')
 
 @app.route('/api/autocomplete')
 def autocomplete():
@@ -1505,23 +2400,10 @@ def autocomplete():
     if not query or len(query) < 2:
         return jsonify({'suggestions': []})
     
-    params = {
-        'q': query,
-        'type': request.args.get('type', 'all'),
-        'limit': int(request.args.get('limit', 8))
-    }
-    
-    result = api_request('/search/autocomplete', params)
+    limit = min(max(request.args.get('limit', 8, type=int), 1), app.config['AUTOCOMPLETE_FETCH_LIMIT'])
+    suggestions = fetch_autocomplete_suggestions(query, request.args.get('type', 'all'), limit)
     
-    if result and 'data' in result:
-        suggestions = []
-        for suggestion in result['data']['suggestions']:
-            suggestions.append({
-                'text': suggestion['text'],
-                'type': suggestion['type'],
-                'preview': suggestion.get('preview', suggestion['text']),
-                'work_count': suggestion.get('work_count')
-            })
+    if suggestions:
         return jsonify({'suggestions': suggestions})
     
     return jsonify({'suggestions': []})
@@ -1603,6 +2485,18 @@ def license_page():
     """Página da licença MIT do projeto"""
     return render_template('pages/license.html')
 
+@app.route('/sitemap.xml')
+def sitemap_index():
+    """Sitemap index written by `flask sitemap`"""
+    return send_from_directory(app.config['SITEMAP_DIR'], SitemapBuilder.INDEX_FILE, mimetype='application/xml')
+
+@app.route('/sitemaps/<name>')
+def sitemap_file(name):
+    """One gzipped sitemap file listed in the index"""
+    if not name.endswith('.xml.gz'):
+        abort(404)
+    return send_from_directory(app.config['SITEMAP_DIR'], name, mimetype='application/gzip')
+
 @app.errorhandler(404)
 def not_found(error):
     return render_template('errors/404.html'), 404
@@ -1611,8 +2505,271 @@ def not_found(error):
 def server_error(error):
     return render_template('errors/500.html'), 500
 
+def _warm_target(target, refresh=False, base_url=None):
+    """Fetch a single warm-up target, returning (label, ok, elapsed seconds)"""
+    started = time.time()
+    try:
+        if isinstance(target, str):
+            label = target
+            if base_url:
+                response = requests.get(f"{base_url.rstrip('/')}{target}", timeout=app.config['API_TIMEOUT'] * 2)
+                ok = response.status_code == 200
+            else:
+                _cache_refresh.active = refresh
+                try:
+                    with app.test_client() as client:
+                        ok = client.get(target).status_code == 200
+                finally:
+                    _cache_refresh.active = False
+        else:
+            endpoint, params = target
+            label = f"api:{endpoint}"
+            _cache_refresh.active = refresh
+            try:
+                ok = api_request(endpoint, params, use_cache=True) is not None
+            finally:
+                _cache_refresh.active = False
+    except Exception as e:
+        app.logger.warning(f"Cache warm-up failed for {target}: {e}")
+        label = str(target)
+        ok = False
+    return label, ok, time.time() - started
+
+def warm_cache(refresh=False, concurrency=None, base_url=None):
+    """Walk the configured hot routes and API calls with bounded concurrency"""
+    targets = list(app.config['WARM_CACHE_ROUTES'])
+    if not base_url:
+        targets += list(app.config['WARM_CACHE_API_CALLS'])
+    
+    workers = concurrency or app.config['WARM_CACHE_CONCURRENCY']
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cache-warmup') as executor:
+        results = list(executor.map(lambda target: _warm_target(target, refresh, base_url), targets))
+    
+    failed = [label for label, ok, _ in results if not ok]
+    app.logger.info(f"Cache warm-up finished: {len(results) - len(failed)}/{len(results)} targets ok")
+    return results
+
+def _cache_refresh_loop():
+    while True:
+        time.sleep(app.config['WARM_CACHE_INTERVAL'])
+        try:
+            warm_cache(refresh=True)
+        except Exception as e:
+            app.logger.error(f"Scheduled cache refresh failed: {e}")
+
+@app.cli.command('warm-cache')
+@click.option('--url', 'base_url', required=True,
+              help='Base URL of the running site to warm over HTTP, e.g. http://127.0.0.1:8888.')
+@click.option('--concurrency', type=int, default=None, help='Maximum parallel warm-up requests.')
+@click.option('--passes', type=int, default=1,
+              help='Repeat the walk; the server picks the worker for each request, so this does not '
+                   'guarantee every worker is reached.')
+def warm_cache_command(base_url, concurrency, passes):
+    """Fill the cache of a running site for its hot pages.
+    
+    The cache lives in the serving processes, so warming this short-lived
+    CLI process would be thrown away on exit; workers warm themselves from
+    the gunicorn post_fork hook when WARM_CACHE_ON_STARTUP is set.
+    """
+    for _ in range(passes):
+        for label, ok, elapsed in warm_cache(concurrency=concurrency, base_url=base_url):
+            click.echo(f"{'ok' if ok else 'FAIL':4}  {elapsed * 1000:8.1f}ms  {label}")
+
+def static_export_targets(top, work_ids=()):
+    """Paths of the pages to export: fixed routes, top venues and organizations, PPGAS pages and works"""
+    targets = list(app.config['EXPORT_STATIC_ROUTES'])
+    
+    for endpoint, model in (('/venues', Venue), ('/organizations', Organization)):
+        response = api_request(endpoint, {'page': 1, 'limit': top}, model=model)
+        for record in (response or {}).get('data', []):
+            if record.get('id'):
+                targets.append(f"{endpoint}/{record['id']}")
+    
+    if not ppgas_data.ready:
+        ppgas_data.sync()
+    if ppgas_data.ready:
+        courses = ppgas_data.list_courses(1, 1_000_000)['courses']
+        instructors = ppgas_data.list_instructors(1, 1_000_000)['instructors']
+        targets += [f"/courses/ppgas/{course.id}" for course in courses if course.id]
+        targets += [f"/instructors/{instructor.person_id}" for instructor in instructors if instructor.person_id]
+    
+    recent_works = [work.get('id') for work in _generate_homepage_data()['recent_works']]
+    targets += [f"/works/{work_id}" for work_id in [*work_ids, *recent_works] if work_id]
+    return list(dict.fromkeys(targets))
+
+def export_source_version():
+    """Version of the local data pages can be rendered from: the PPGAS dataset sync and the statistics snapshot"""
+    return [ppgas_data.synced_at, max(stats_snapshot.refreshed.values(), default=None)]
+
+def export_page(exporter, path, source_version, max_age, force=False):
+    """Render one page through its view into the export, returning (path, outcome, elapsed seconds)
+    
+    The API offers no change signal (no ETags or per-record timestamps), so a
+    page that called it is re-rendered once it is older than `max_age`, while
+    one rendered only from local data is re-rendered when that data's version
+    changes; otherwise the page is kept without rendering it. Pages are
+    rendered with the response cache bypassed. A page whose upstream calls
+    failed keeps its previous file rather than being overwritten with a
+    degraded render, and a page that is now a 404 is removed.
+    """
+    started = time.time()
+    if not force and exporter.is_fresh(path, source_version, max_age):
+        return path, 'fresh', time.time() - started
+    _cache_refresh.active = True
+    _upstream_calls.entries = []
+    try:
+        with app.test_client() as client:
+            response = client.get(path)
+        calls = _upstream_calls.entries
+        failures = [endpoint for endpoint, ok in calls if not ok]
+        if response.status_code == 404:
+            outcome = exporter.remove(path)
+        elif response.status_code != 200 or failures or 'X-Ethnos-Stale' in response.headers:
+            log.warning('export.page_skipped', path=path, status=response.status_code, failed_endpoints=failures)
+            outcome = 'failed'
+        else:
+            outcome = exporter.write(path, response.get_data(), bool(calls), source_version, force)
+    except Exception as e:
+        log.error('export.page_failed', path=path, error=e)
+        outcome = 'failed'
+    finally:
+        _cache_refresh.active = False
+        _upstream_calls.entries = None
+    return path, outcome, time.time() - started
+
+def export_static(directory=None, top=None, work_ids=(), concurrency=None, force=False, max_age=None):
+    """Render the exported pages in parallel, writing changed ones and removing those no longer exported"""
+    exporter = StaticExporter(directory or app.config['EXPORT_STATIC_DIR'], log)
+    if stats_snapshot.get('totals') is None:
+        stats_snapshot.refresh()
+    source_version = export_source_version()
+    if max_age is None:
+        max_age = app.config['EXPORT_STATIC_MAX_AGE']
+    
+    _upstream_calls.entries = []
+    _cache_refresh.active = True
+    try:
+        targets = static_export_targets(top or app.config['EXPORT_STATIC_TOP'], work_ids)
+        targets_complete = all(ok for _, ok in _upstream_calls.entries)
+    finally:
+        _cache_refresh.active = False
+        _upstream_calls.entries = None
+    
+    timing_footer = app.config['SERVER_TIMING_FOOTER']
+    app.config['SERVER_TIMING_FOOTER'] = False
+    try:
+        workers = concurrency or app.config['EXPORT_STATIC_CONCURRENCY']
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='static-export') as executor:
+            results = list(executor.map(lambda path: export_page(exporter, path, source_version, max_age, force),
+                                        targets))
+    finally:
+        app.config['SERVER_TIMING_FOOTER'] = timing_footer
+    
+    # A listing that failed to load would otherwise prune every page it lists
+    pruned = exporter.prune(set(targets)) if targets_complete else []
+    exporter.save()
+    return results, pruned
+
+@app.cli.command('export-static')
+@click.option('--dir', 'directory', default=None, help='Directory to write the pages to.')
+@click.option('--top', type=int, default=None, help='Venues and organizations to export from each listing.')
+@click.option('--work-ids-file', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='File with one work id per line to export, e.g. the most viewed ones.')
+@click.option('--concurrency', type=int, default=None, help='Maximum parallel page renders.')
+@click.option('--max-age', type=int, default=None,
+              help='Seconds before a page that calls the API is rendered again (default EXPORT_STATIC_MAX_AGE).')
+@click.option('--force', is_flag=True, help='Render and rewrite every page, however recent or unchanged.')
+def export_static_command(directory, top, work_ids_file, concurrency, max_age, force):
+    """Pre-render the most visited pages to HTML files for the web server."""
+    work_ids = list(app.config['EXPORT_STATIC_WORK_IDS'])
+    if work_ids_file:
+        with open(work_ids_file) as f:
+            work_ids += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    
+    results, pruned = export_static(directory, top, work_ids, concurrency, force, max_age)
+    outcomes = {}
+    for path, outcome, elapsed in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        click.echo(f"{outcome:9}  {elapsed * 1000:8.1f}ms  {path}")
+    for path in pruned:
+        click.echo(f"{'pruned':9}  {'':10}  {path}")
+    summary = ', '.join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items()))
+    click.echo(f"Exported {len(results)} pages: {summary}; {len(pruned)} pruned")
+
+SITEMAP_SOURCES = {
+    'works': ('/works', '/works/{id}'),
+    'venues': ('/venues', '/venues/{id}'),
+    'organizations': ('/organizations', '/organizations/{id}'),
+    'persons': ('/persons', '/persons/{id}/works')
+}
+
+@app.cli.command('sitemap')
+@click.argument('sources', nargs=-1, type=click.Choice(list(SITEMAP_SOURCES)))
+@click.option('--full', is_flag=True, help='Rebuild every file instead of resuming after the last filled one.')
+@click.option('--concurrency', type=int, default=None, help='Maximum listing pages fetched in parallel.')
+def sitemap_command(sources, full, concurrency):
+    """Write gzipped sitemaps of the catalog and their index."""
+    builder = SitemapBuilder(app.config['SITEMAP_DIR'], app.config['SITEMAP_BASE_URL'],
+                             lambda endpoint, params: api_request(endpoint, params, use_cache=False),
+                             app.config['SITEMAP_PAGE_SIZE'], app.config['SITEMAP_URLS_PER_FILE'],
+                             concurrency or app.config['SITEMAP_CONCURRENCY'], log)
+    summaries = builder.build({name: SITEMAP_SOURCES[name] for name in sources or SITEMAP_SOURCES}, full)
+    for name, summary in summaries.items():
+        click.echo(f"{'ok' if summary['complete'] else 'PARTIAL':7}  {name:14} {summary['urls']:9} urls  "
+                   f"{summary['files']:4} files ({summary['written']} written from page {summary['resumed_from_page']})  "
+                   f"{summary['duration_s']}s")
+
+if app.config['METRICS_ENABLED'] and app.config['METRICS_DIR']:
+    start_flush_thread(metrics, app.config['METRICS_DIR'], app.config['METRICS_FLUSH_INTERVAL'],
+                       collect=_collect_runtime_gauges)
+
+_owner_locks = []
+
+def claim_background_owner(path):
+    """Whether this process refreshes and writes the shared file at `path`
+    
+    The first process to lock `<path>.lock` owns it until it exits; the
+    others only read what it saves. Without a path, or when the lock file
+    cannot be created, every process refreshes its own copy.
+    """
+    if not path:
+        return True
+    try:
+        lock = open(f"{path}.lock", 'w')
+    except OSError:
+        return True
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return False
+    _owner_locks.append(lock)
+    return True
+
+def start_background_tasks():
+    """Start the threads that refresh data from the API in a serving process
+    
+    Called from the gunicorn post_fork hook (gunicorn.conf.py) and before
+    app.run, never on import, so CLI commands and scripts importing the app
+    do not call the API in the background. Those are the only supported
+    entry points for serving: under `flask run` the statistics snapshot is
+    never refreshed.
+    """
+    stats_snapshot.start(owner=claim_background_owner(app.config['STATS_SNAPSHOT_FILE']))
+    ppgas_data.start(owner=claim_background_owner(app.config['PPGAS_DATASET_FILE']))
+    
+    if app.config['WARM_CACHE_ON_STARTUP']:
+        warm_cache()
+    
+    if app.config['WARM_CACHE_INTERVAL'] > 0:
+        threading.Thread(target=_cache_refresh_loop, daemon=True).start()
+    
+    if app.config['AUTOCOMPLETE_PREWARM']:
+        threading.Thread(target=prewarm_autocomplete_cache, daemon=True).start()
+
 if __name__ == '__main__':
     import os
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_ENV') == 'development'
+    start_background_tasks()
     app.run(debug=debug, host='0.0.0.0', port=port)
\ No newline at end of file
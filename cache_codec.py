@@ -0,0 +1,57 @@
+import zlib
+
+import fast_json
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+def resolve_codec(name):
+    """Codec for a CACHE_COMPRESSION setting, or None when compression is off.
+
+    'auto' prefers lz4 and falls back to zlib, as does 'lz4' when the
+    package is not installed.
+    """
+    name = (name or 'off').lower()
+    if name in ('off', 'false', 'none', ''):
+        return None
+    if name in ('lz4', 'auto') and lz4_frame:
+        return 'lz4'
+    return 'zlib'
+
+class CompressedEntry:
+    """A cached JSON document kept as compressed bytes and decoded on every read"""
+
+    __slots__ = ('codec', 'blob', 'raw_size')
+
+    def __init__(self, codec, raw, level):
+        self.codec = codec
+        self.raw_size = len(raw)
+        if codec == 'lz4':
+            self.blob = lz4_frame.compress(raw, compression_level=level)
+        else:
+            self.blob = zlib.compress(raw, level)
+
+    def decode(self):
+        if self.codec == 'lz4':
+            raw = lz4_frame.decompress(self.blob)
+        else:
+            raw = zlib.decompress(self.blob)
+        return fast_json.loads(raw)
+
+def compress_json(data, codec, threshold, level, raw=None):
+    """Wrap data in a CompressedEntry when its JSON encoding reaches the size threshold.
+
+    `raw` is the already-encoded document when the caller has it, such as an
+    upstream response body; otherwise the data is encoded here, and data that
+    is not plain JSON (view models) is kept as it is.
+    """
+    if raw is None:
+        try:
+            raw = fast_json.dumps(data).encode()
+        except TypeError:
+            return data
+    if len(raw) < threshold:
+        return data
+    return CompressedEntry(codec, raw, level)
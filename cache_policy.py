@@ -0,0 +1,49 @@
+from fnmatch import fnmatchcase
+
+class CachePolicy:
+    """How responses of one endpoint are cached.
+
+    `ttl` is how long an entry is fresh and `stale` how much longer it is
+    kept to answer for the upstream when a refetch fails. `negative_ttl`
+    caches a 404 for that long (0 disables) and responses larger than
+    `max_bytes` are not cached.
+    """
+
+    __slots__ = ('cache', 'ttl', 'stale', 'negative_ttl', 'max_bytes')
+
+    def __init__(self, cache=True, ttl=300, stale=0, negative_ttl=0, max_bytes=None):
+        self.cache = cache
+        self.ttl = ttl
+        self.stale = stale
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+
+    def __repr__(self):
+        return (f"CachePolicy(cache={self.cache}, ttl={self.ttl}, stale={self.stale}, "
+                f"negative_ttl={self.negative_ttl}, max_bytes={self.max_bytes})")
+
+class CachePolicyTable:
+    """Endpoint template patterns mapped to cache policies; the first matching pattern wins.
+
+    Patterns are matched with fnmatch against endpoint templates such as
+    '/works/{id}/references', and each rule only lists the settings that
+    differ from `defaults`. Lookups are memoized per template.
+    """
+
+    def __init__(self, rules, defaults):
+        self.defaults = dict(defaults)
+        self.rules = [(pattern, CachePolicy(**{**self.defaults, **settings})) for pattern, settings in rules]
+        self.default = CachePolicy(**self.defaults)
+        self._resolved = {}
+
+    def lookup(self, endpoint_template):
+        policy = self._resolved.get(endpoint_template)
+        if policy is None:
+            policy = next((policy for pattern, policy in self.rules if fnmatchcase(endpoint_template, pattern)),
+                          self.default)
+            self._resolved[endpoint_template] = policy
+        return policy
+
+    def describe(self):
+        return [{'pattern': pattern, **{name: getattr(policy, name) for name in CachePolicy.__slots__}}
+                for pattern, policy in self.rules + [('*', self.default)]]
@@ -1,3 +1,4 @@
+import json
 import os
 
 class Config:
@@ -7,12 +8,148 @@ class Config:
     # Cache Configuration
     CACHE_DURATION = 300  # 5 minutes
     HOMEPAGE_CACHE_DURATION = 600  # 10 minutes
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 20000))  # Least recently used entries are evicted past this
+    
+    # Cache Policy Configuration
+    CACHE_POLICY_DEFAULTS = {
+        'ttl': CACHE_DURATION,
+        'stale': int(os.environ.get('CACHE_STALE_GRACE', 3600)),  # Seconds an expired entry may answer for a failing API
+        'negative_ttl': 60,  # Seconds a 404 is remembered
+        'max_bytes': int(os.environ.get('CACHE_MAX_ENTRY_BYTES', 2 * 1024 * 1024))
+    }
+    # First matching endpoint template wins; CACHE_POLICY_OVERRIDES takes a JSON list of [pattern, settings]
+    CACHE_POLICIES = json.loads(os.environ.get('CACHE_POLICY_OVERRIDES', '[]')) + [
+        ('/search/*', {'cache': False}),  # Search results have their own cache
+        ('/metrics/*', {'cache': False}),  # Aggregates are kept by the statistics snapshot
+        ('/venues/statistics', {'cache': False}),
+        ('/courses/statistics', {'cache': False}),
+        ('/instructors/statistics', {'cache': False}),
+        ('/courses*', {'ttl': 86400, 'stale': 604800}),
+        ('/instructors*', {'ttl': 86400, 'stale': 604800}),
+        ('/*/{id}/works', {'ttl': 900, 'stale': 86400}),
+        ('/works/{id}*', {'ttl': 3600, 'stale': 86400, 'negative_ttl': 600}),
+        ('/persons/{id}', {'ttl': 3600, 'stale': 86400, 'negative_ttl': 600}),
+        ('/venues/{id}', {'ttl': 3600, 'stale': 86400, 'negative_ttl': 600}),
+        ('/organizations/{id}', {'ttl': 3600, 'stale': 86400, 'negative_ttl': 600}),
+        ('/signatures/{id}', {'ttl': 3600, 'stale': 86400, 'negative_ttl': 600}),
+    ]
+    
+    # Cache Compression Configuration
+    CACHE_COMPRESSION = os.environ.get('CACHE_COMPRESSION', 'off')  # off, zlib, lz4 or auto
+    CACHE_COMPRESSION_THRESHOLD = int(os.environ.get('CACHE_COMPRESSION_THRESHOLD', 8192))  # Bytes of JSON
+    CACHE_COMPRESSION_LEVEL = int(os.environ.get('CACHE_COMPRESSION_LEVEL', 1))
+    
+    # Search Cache Configuration
+    SEARCH_CACHE_DURATION = int(os.environ.get('SEARCH_CACHE_DURATION', 180))
+    SEARCH_FOLD_ACCENTS = os.environ.get('SEARCH_FOLD_ACCENTS', 'false').lower() == 'true'
+    
+    # Autocomplete Cache Configuration
+    AUTOCOMPLETE_CACHE_DURATION = int(os.environ.get('AUTOCOMPLETE_CACHE_DURATION', 900))
+    AUTOCOMPLETE_CACHE_MAX_ENTRIES = int(os.environ.get('AUTOCOMPLETE_CACHE_MAX_ENTRIES', 2000))
+    AUTOCOMPLETE_FETCH_LIMIT = 20  # Upstream limit used so short prefixes can answer longer ones
+    AUTOCOMPLETE_PREWARM = os.environ.get('AUTOCOMPLETE_PREWARM', 'true').lower() == 'true'
+    
+    # Cache Warm-up Configuration
+    WARM_CACHE_ROUTES = [route for route in os.environ.get(
+        'WARM_CACHE_ROUTES',
+        '/,/works,/venues/complete,/organizations/complete,/ppgas,/courses/ppgas'
+    ).split(',') if route]
+    WARM_CACHE_API_CALLS = []  # (endpoint, params) pairs; aggregate statistics come from the stats snapshot
+    WARM_CACHE_CONCURRENCY = int(os.environ.get('WARM_CACHE_CONCURRENCY', 4))
+    WARM_CACHE_ON_STARTUP = os.environ.get('WARM_CACHE_ON_STARTUP', 'false').lower() == 'true'
+    WARM_CACHE_INTERVAL = int(os.environ.get('WARM_CACHE_INTERVAL', 0))  # Seconds, 0 disables refresh
+    
+    # Static Export Configuration
+    EXPORT_STATIC_DIR = os.environ.get('EXPORT_STATIC_DIR', '/tmp/ethnos_static_export')
+    EXPORT_STATIC_ROUTES = [route for route in os.environ.get(
+        'EXPORT_STATIC_ROUTES',
+        '/,/works,/venues/complete,/organizations/complete,/ppgas,/courses/ppgas,/instructors'
+    ).split(',') if route]
+    EXPORT_STATIC_TOP = int(os.environ.get('EXPORT_STATIC_TOP', 50))  # Venues and organizations from the top of each listing
+    EXPORT_STATIC_WORK_IDS = [work_id for work_id in os.environ.get('EXPORT_STATIC_WORK_IDS', '').split(',') if work_id]
+    EXPORT_STATIC_CONCURRENCY = int(os.environ.get('EXPORT_STATIC_CONCURRENCY', 4))
+    EXPORT_STATIC_MAX_AGE = int(os.environ.get('EXPORT_STATIC_MAX_AGE', 6 * 3600))  # Seconds before a page that calls the API is rendered again
+    
+    # Sitemap Configuration
+    SITEMAP_DIR = os.environ.get('SITEMAP_DIR', '/tmp/ethnos_sitemap')
+    SITEMAP_BASE_URL = os.environ.get('SITEMAP_BASE_URL', 'https://ethnos.app')
+    SITEMAP_PAGE_SIZE = int(os.environ.get('SITEMAP_PAGE_SIZE', 100))  # Records per upstream listing page
+    SITEMAP_URLS_PER_FILE = int(os.environ.get('SITEMAP_URLS_PER_FILE', 50000))  # Protocol maximum
+    SITEMAP_CONCURRENCY = int(os.environ.get('SITEMAP_CONCURRENCY', 4))
+    
+    # Statistics Snapshot Configuration
+    STATS_REFRESH_INTERVAL = int(os.environ.get('STATS_REFRESH_INTERVAL', 600))  # Seconds, 0 refreshes once at startup
+    STATS_SNAPSHOT_FILE = os.environ.get('STATS_SNAPSHOT_FILE', '/tmp/ethnos_stats_snapshot.json')  # Empty disables
+    
+    # PPGAS Dataset Configuration
+    PPGAS_SYNC_INTERVAL = int(os.environ.get('PPGAS_SYNC_INTERVAL', 86400))  # Seconds, 0 syncs once at startup
+    PPGAS_DATASET_FILE = os.environ.get('PPGAS_DATASET_FILE', '/tmp/ethnos_ppgas_dataset.json')  # Empty disables
+    PPGAS_SYNC_CONCURRENCY = int(os.environ.get('PPGAS_SYNC_CONCURRENCY', 4))
+    
+    # Speculative Pagination Prefetch
+    PREFETCH_ENABLED = os.environ.get('PREFETCH_ENABLED', 'false').lower() == 'true'
+    PREFETCH_CONCURRENCY = int(os.environ.get('PREFETCH_CONCURRENCY', 2))
+    PREFETCH_MAX_INFLIGHT = int(os.environ.get('PREFETCH_MAX_INFLIGHT', 16))  # Skip when upstream is this busy
+    PREFETCH_MAX_LATENCY = float(os.environ.get('PREFETCH_MAX_LATENCY', 2.0))  # Seconds, smoothed upstream latency
+    
+    # Filtered Listing Fill
+    FILL_PAGE_CONCURRENCY = int(os.environ.get('FILL_PAGE_CONCURRENCY', 3))  # Upstream pages fetched ahead in parallel
+    FILL_PAGE_MAX_UPSTREAM_PAGES = int(os.environ.get('FILL_PAGE_MAX_UPSTREAM_PAGES', 8))  # Per request
+    FILL_PAGE_CURSOR_DURATION = int(os.environ.get('FILL_PAGE_CURSOR_DURATION', 1800))  # Seconds
+    
+    # Admission Control
+    ADMISSION_ENABLED = os.environ.get('ADMISSION_ENABLED', 'true').lower() == 'true'
+    ADMISSION_CLIENT_RATE = float(os.environ.get('ADMISSION_CLIENT_RATE', 0))  # Requests per second per client, 0 disables
+    ADMISSION_CLIENT_BURST = int(os.environ.get('ADMISSION_CLIENT_BURST', 30))
+    ADMISSION_TRUST_FORWARDED = os.environ.get('ADMISSION_TRUST_FORWARDED', 'false').lower() == 'true'  # Client from X-Forwarded-For
+    ADMISSION_MAX_UPSTREAM_INFLIGHT = int(os.environ.get('ADMISSION_MAX_UPSTREAM_INFLIGHT', 32))
+    ADMISSION_MAX_QUEUE = int(os.environ.get('ADMISSION_MAX_QUEUE', 64))
+    ADMISSION_QUEUE_TIMEOUT = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 2.0))  # Seconds
+    ADMISSION_SHED_LATENCY = float(os.environ.get('ADMISSION_SHED_LATENCY', 5.0))  # Seconds, smoothed upstream latency
+    ADMISSION_SHED_QUEUE_DEPTH = int(os.environ.get('ADMISSION_SHED_QUEUE_DEPTH', 32))
+    ADMISSION_RETRY_AFTER = int(os.environ.get('ADMISSION_RETRY_AFTER', 10))  # Seconds
+    ADMISSION_STALE_PAGE_DURATION = int(os.environ.get('ADMISSION_STALE_PAGE_DURATION', 900))  # Seconds, 0 disables
     
     # Pagination Configuration  
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
     DEFAULT_LIMIT = 25
     
+    # Federated Search Configuration
+    SEARCH_EXECUTOR_WORKERS = int(os.environ.get('SEARCH_EXECUTOR_WORKERS', 8))
+    SEARCH_SECTION_TIMEOUT = float(os.environ.get('SEARCH_SECTION_TIMEOUT', 4))
+    SEARCH_LIVE_DEADLINE = float(os.environ.get('SEARCH_LIVE_DEADLINE', 5))
+    
+    # Metrics Configuration
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_DIR = os.environ.get('METRICS_DIR')  # Shared directory for multi-worker aggregation
+    METRICS_FLUSH_INTERVAL = int(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+    
+    # Server-Timing Configuration
+    SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+    SERVER_TIMING_FOOTER = os.environ.get('SERVER_TIMING_FOOTER', 'false').lower() == 'true'
+    
+    # Sampling Profiler Configuration
+    PROFILER_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', 0))  # Fraction of requests, 0 disables
+    PROFILER_ROUTES = [route for route in os.environ.get('PROFILER_ROUTES', '').split(',') if route]
+    PROFILER_TOKEN = os.environ.get('PROFILER_TOKEN')  # Enables profiling via the X-Ethnos-Profile header
+    PROFILER_INTERVAL = float(os.environ.get('PROFILER_INTERVAL', 0.005))
+    PROFILER_DIR = os.environ.get('PROFILER_DIR', '/tmp/ethnos_profiles')
+    
+    # Template Cache Configuration
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR', '/tmp/ethnos_jinja_cache')  # Empty disables
+    FRAGMENT_CACHE_ENABLED = os.environ.get('FRAGMENT_CACHE_ENABLED', 'true').lower() == 'true'
+    
+    # Logging Configuration
+    LOG_LEVEL = os.environ.get('LOG_LEVEL')  # e.g. DEBUG; Flask's default when unset
+    LOG_QUEUE_ENABLED = os.environ.get('LOG_QUEUE_ENABLED', 'true').lower() == 'true'
+    LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', 0.1))  # Share of high-volume debug events kept
+    
     # Request Configuration
     API_TIMEOUT = 15
-    API_RETRY_COUNT = 2
\ No newline at end of file
+    API_RETRY_COUNT = 2
+    REQUEST_BUDGET = float(os.environ.get('REQUEST_BUDGET', 25))  # Seconds for all upstream calls of one request
+    API_MIN_ATTEMPT_TIMEOUT = float(os.environ.get('API_MIN_ATTEMPT_TIMEOUT', 1.0))  # No attempt starts with less left
+    API_BACKOFF_BASE = float(os.environ.get('API_BACKOFF_BASE', 0.25))  # Seconds, doubled per retry, full jitter
+    API_BACKOFF_MAX = float(os.environ.get('API_BACKOFF_MAX', 4.0))
+    OPTIONAL_SECTION_MIN_BUDGET = float(os.environ.get('OPTIONAL_SECTION_MIN_BUDGET', 5.0))  # Seconds left
\ No newline at end of file
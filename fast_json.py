@@ -0,0 +1,64 @@
+import hashlib
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson else 'json'
+
+def loads(data):
+    """Decode a JSON document given as bytes or str"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, sort_keys=False, default=None):
+    """Encode to compact JSON text"""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option).decode()
+    return json.dumps(obj, sort_keys=sort_keys, default=default, ensure_ascii=False, separators=(',', ':'))
+
+def canonical_key(namespace, params=None):
+    """Cache key for a namespace and parameter mapping, independent of key order.
+
+    The parameters are serialized with sorted keys and hashed, so keys stay
+    short however long the query strings are. Empty parameters map to
+    '<namespace>:None'.
+    """
+    if not params:
+        return f"{namespace}:None"
+    encoded = dumps(params, sort_keys=True, default=str).encode()
+    return f"{namespace}:{hashlib.blake2b(encoded, digest_size=16).hexdigest()}"
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson when it is installed.
+
+    Dates keep the provider's formatting and objects with a to_dict method
+    (view models) serialize as that mapping. Pretty-printed output (debug
+    mode) and encoder arguments orjson does not support fall back to the
+    default provider.
+    """
+
+    @staticmethod
+    def default(o):
+        if hasattr(o, 'to_dict'):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        compact = kwargs.get('separators', (',', ':')) == (',', ':')
+        if orjson is None or not compact or set(kwargs) - {'sort_keys', 'separators'}:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=kwargs.get('sort_keys', self.sort_keys), default=self.default)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
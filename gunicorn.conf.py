@@ -0,0 +1,6 @@
+# Loaded by gunicorn from the working directory; workers start the app's
+# background refresh threads after forking rather than on import.
+
+def post_fork(server, worker):
+    from app import start_background_tasks
+    start_background_tasks()
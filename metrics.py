@@ -0,0 +1,160 @@
+import json
+import os
+import re
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0)
+
+_ID_SEGMENT = re.compile(r'/[^/]*\d[^/]*(?=/|$)')
+
+def endpoint_template(endpoint):
+    """Collapse identifier path segments so '/works/123/metrics' becomes '/works/{id}/metrics'"""
+    return _ID_SEGMENT.sub('/{id}', endpoint)
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in (labels or {}).items()))
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + list(extra or [])
+    if not pairs:
+        return ''
+    escaped = []
+    for key, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{key}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+class MetricsRegistry:
+    """In-process counters, gauges and histograms rendered in Prometheus text format.
+
+    Each worker keeps its own values and can flush them to a shared directory;
+    aggregate() sums the snapshots of all live workers so any worker can serve
+    the scrape for the whole pool.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._descriptions = {}
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+
+    def describe(self, name, kind, description):
+        self._descriptions[name] = (kind, description)
+
+    def inc(self, name, labels=None, value=1):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, labels=None):
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name, value, labels=None):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram['buckets'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'buckets': list(self.buckets),
+                'counters': [[name, dict(labels), value] for (name, labels), value in self._counters.items()],
+                'gauges': [[name, dict(labels), value] for (name, labels), value in self._gauges.items()],
+                'histograms': [[name, dict(labels), dict(histogram, buckets=list(histogram['buckets']))]
+                               for (name, labels), histogram in self._histograms.items()]
+            }
+
+    def flush(self, directory):
+        """Atomically write this worker's snapshot to the shared metrics directory"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{os.getpid()}.json')
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(temp_path, path)
+
+    def aggregate(self, directory):
+        """Merge the snapshots of all live workers found in the shared directory"""
+        merged = {'buckets': list(self.buckets), 'counters': {}, 'gauges': {}, 'histograms': {}}
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                pid = int(filename[:-5])
+                os.kill(pid, 0)
+            except (ValueError, ProcessLookupError):
+                continue
+            except PermissionError:
+                pass
+            try:
+                with open(os.path.join(directory, filename), encoding='utf-8') as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for kind in ('counters', 'gauges'):
+                for name, labels, value in snapshot[kind]:
+                    key = (name, _label_key(labels))
+                    merged[kind][key] = merged[kind].get(key, 0) + value
+            for name, labels, histogram in snapshot['histograms']:
+                key = (name, _label_key(labels))
+                target = merged['histograms'].setdefault(
+                    key, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+                target['buckets'] = [a + b for a, b in zip(target['buckets'], histogram['buckets'])]
+                target['sum'] += histogram['sum']
+                target['count'] += histogram['count']
+        return {
+            'buckets': merged['buckets'],
+            'counters': [[name, dict(labels), value] for (name, labels), value in merged['counters'].items()],
+            'gauges': [[name, dict(labels), value] for (name, labels), value in merged['gauges'].items()],
+            'histograms': [[name, dict(labels), histogram] for (name, labels), histogram in merged['histograms'].items()]
+        }
+
+    def render(self, snapshot=None):
+        """Render a snapshot (this worker's by default) in Prometheus text exposition format"""
+        snapshot = snapshot or self.snapshot()
+        series = {}
+        for kind in ('counters', 'gauges', 'histograms'):
+            for name, labels, value in snapshot[kind]:
+                series.setdefault(name, []).append((kind, _label_key(labels), value))
+
+        lines = []
+        for name in sorted(series):
+            kind, description = self._descriptions.get(name, (series[name][0][0][:-1], name))
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            for _, labels, value in sorted(series[name], key=lambda item: item[1]):
+                if isinstance(value, dict):
+                    for bound, count in zip(snapshot['buckets'], value['buckets']):
+                        lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {count}')
+                    lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {value["count"]}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {value["sum"]:.6f}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {value["count"]}')
+                else:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+def start_flush_thread(registry, directory, interval, collect=None):
+    """Periodically flush a registry to the shared directory from a daemon thread"""
+    def loop():
+        while True:
+            try:
+                if collect:
+                    collect()
+                registry.flush(directory)
+            except OSError:
+                pass
+            time.sleep(interval)
+    thread = threading.Thread(target=loop, daemon=True, name='metrics-flush')
+    thread.start()
+    return thread
@@ -0,0 +1,239 @@
+import os
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+import fast_json
+from view_models import Course, Instructor
+
+def _fold(text):
+    text = unicodedata.normalize('NFKD', str(text or '').lower())
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+def _page(records, page, limit, key):
+    total = len(records)
+    limit = max(limit, 1)
+    page = max(page, 1)
+    start = (page - 1) * limit
+    total_pages = max(1, (total + limit - 1) // limit)
+    return {
+        key: records[start:start + limit],
+        'pagination': {
+            'page': page,
+            'limit': limit,
+            'offset': start,
+            'total': total,
+            'totalPages': total_pages,
+            'hasNext': page < total_pages,
+            'hasPrev': page > 1,
+            'has_next': page < total_pages,
+            'has_prev': page > 1
+        }
+    }
+
+class _Index:
+    """Lookup structures over one synced copy of the dataset; replaced whole on every sync"""
+
+    def __init__(self, data):
+        self.data = data
+        self.courses = [Course.from_payload(course) for course in data['courses']]
+        self.course_text = [_fold(f"{course.name} {course.code} {course.instructors or ''}") for course in self.courses]
+        self.instructors = [Instructor.from_payload(instructor) for instructor in data['instructors']]
+        self.instructor_text = [_fold(instructor.preferred_name) for instructor in self.instructors]
+
+class PPGASDataset:
+    """Every PPGAS course and instructor, with course bibliographies and instructor profiles, held in memory.
+
+    The whole dataset is fetched through `fetch(endpoint, params)` every
+    `interval` seconds and swapped in at once, so pages listing, filtering
+    and showing courses and instructors never call the API. A failed sync
+    keeps the previous copy, and per-record failures keep that record's
+    previous details. The last good copy is saved to `path` so a restarted
+    worker starts from it.
+    """
+
+    FOLLOW_INTERVAL = 30  # Seconds between checks of the saved file by a following process
+
+    def __init__(self, fetch, interval, path=None, concurrency=4, page_size=100, log=None):
+        self.fetch = fetch
+        self.interval = interval
+        self.path = path
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.log = log
+        self._index = None
+        self._loaded_mtime = None
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def ready(self):
+        return self._index is not None
+
+    @property
+    def synced_at(self):
+        return self._index.data.get('synced_at') if self._index else None
+
+    def list_courses(self, page=1, limit=20, q=None, year=None, semester=None):
+        index = self._index
+        courses = index.courses
+        if q or year or semester:
+            folded = _fold(q) if q else None
+            courses = [course for course, text in zip(index.courses, index.course_text)
+                       if (not folded or folded in text) and
+                       (not year or str(course.year) == str(year)) and
+                       (not semester or str(course.semester) == str(semester))]
+        return _page(courses, page, limit, 'courses')
+
+    def list_instructors(self, page=1, limit=20, q=None):
+        index = self._index
+        instructors = index.instructors
+        if q:
+            folded = _fold(q)
+            instructors = [instructor for instructor, text in zip(index.instructors, index.instructor_text)
+                           if folded in text]
+        return _page(instructors, page, limit, 'instructors')
+
+    def course(self, course_id):
+        return self._index.data['course_details'].get(str(course_id))
+
+    def instructor_statistics(self, instructor_id):
+        return self._index.data['instructor_statistics'].get(str(instructor_id))
+
+    def instructor_courses(self, instructor_id):
+        return self._index.data['instructor_courses'].get(str(instructor_id))
+
+    def sync(self):
+        """Fetch the whole dataset and swap it in; returns False and keeps the current copy on failure"""
+        with self._lock:
+            started = time.time()
+            courses = self._fetch_all('/courses', 'courses', 'id', 'page')
+            instructors = self._fetch_all('/instructors', 'instructors', 'person_id', 'offset')
+            if courses is None or instructors is None:
+                if self.log:
+                    self.log.warning('ppgas.sync_failed', courses=courses is not None,
+                                     instructors=instructors is not None)
+                return False
+
+            previous = self._index.data if self._index else {}
+            course_ids = [str(course.get('id')) for course in courses]
+            instructor_ids = [str(instructor.get('person_id')) for instructor in instructors]
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='ppgas-sync') as executor:
+                details = executor.map(lambda course_id: self.fetch(f'/courses/{course_id}'), course_ids)
+                statistics = executor.map(lambda person_id: self.fetch(f'/instructors/{person_id}/statistics'),
+                                          instructor_ids)
+                taught = executor.map(lambda person_id: self.fetch(f'/instructors/{person_id}/courses'),
+                                      instructor_ids)
+                data = {
+                    'courses': courses,
+                    'instructors': instructors,
+                    'course_details': self._merge(course_ids, details, previous.get('course_details')),
+                    'instructor_statistics': self._merge(instructor_ids, statistics,
+                                                         previous.get('instructor_statistics')),
+                    'instructor_courses': self._merge(instructor_ids, taught, previous.get('instructor_courses')),
+                    'synced_at': time.time()
+                }
+
+            self._index = _Index(data)
+            self._save(data)
+            if self.log:
+                self.log.info('ppgas.synced', courses=len(courses), instructors=len(instructors),
+                              duration_ms=round((time.time() - started) * 1000))
+            return True
+
+    def start(self, owner=True):
+        """Sync on a daemon thread now if the saved copy is missing or stale, then every `interval` seconds
+
+        With owner=False another process syncs and saves the dataset, and
+        this one reloads the saved file whenever it changes.
+        """
+        thread = threading.Thread(target=self._run if owner else self._follow, daemon=True, name='ppgas-sync')
+        thread.start()
+        return thread
+
+    def _run(self):
+        synced_at = self.synced_at
+        if synced_at and self.interval > 0:
+            time.sleep(max(0, synced_at + self.interval - time.time()))
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                if self.log:
+                    self.log.error('ppgas.sync_error', error=e)
+            if self.interval <= 0:
+                return
+            time.sleep(self.interval)
+
+    def _follow(self):
+        while True:
+            time.sleep(self.FOLLOW_INTERVAL)
+            try:
+                changed = os.path.getmtime(self.path) != self._loaded_mtime
+            except OSError:
+                changed = False
+            if changed:
+                self._load()
+
+    def _fetch_all(self, endpoint, key, id_key, paging):
+        """Every record of a listing, paged by 'page' number or by 'offset' as the endpoint expects, or None
+
+        Paging stops once `pagination.total` records were read, and a page
+        repeating the previous one's ids fails the fetch, so an endpoint
+        ignoring the paging parameter cannot loop forever.
+        """
+        records = []
+        previous_ids = None
+        page = 1
+        while True:
+            position = {'page': page} if paging == 'page' else {'offset': len(records)}
+            response = self.fetch(endpoint, {**position, 'limit': self.page_size})
+            if not response or not isinstance(response.get(key), list):
+                return None
+            page_ids = [record.get(id_key) for record in response[key]]
+            if page_ids and page_ids == previous_ids:
+                if self.log:
+                    self.log.warning('ppgas.page_repeated', endpoint=endpoint, paging=paging, page=page)
+                return None
+            previous_ids = page_ids
+            records.extend(response[key])
+            pagination = response.get('pagination') or {}
+            total = pagination.get('total')
+            if (not response[key] or not pagination.get('hasNext', len(response[key]) == self.page_size) or
+                    isinstance(total, int) and len(records) >= total):
+                return records
+            page += 1
+
+    @staticmethod
+    def _merge(ids, fetched, previous):
+        previous = previous or {}
+        merged = {}
+        for record_id, value in zip(ids, fetched):
+            value = value if value is not None else previous.get(record_id)
+            if value is not None:
+                merged[record_id] = value
+        return merged
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            self._loaded_mtime = os.path.getmtime(self.path)
+            with open(self.path, 'rb') as f:
+                self._index = _Index(fast_json.loads(f.read()))
+        except (OSError, ValueError, KeyError) as e:
+            if self.log:
+                self.log.warning('ppgas.load_failed', path=self.path, error=e)
+
+    def _save(self, data):
+        if not self.path:
+            return
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(fast_json.dumps(data))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            if self.log:
+                self.log.warning('ppgas.save_failed', path=self.path, error=e)
@@ -0,0 +1,83 @@
+import os
+import sys
+import threading
+import time
+
+CATEGORIES = ('json', 'jinja', 'api_request', 'other')
+
+def _frame_label(frame):
+    code = frame.f_code
+    parent, filename = os.path.split(code.co_filename)
+    return f"{code.co_name} ({os.path.basename(parent)}/{filename})"
+
+def _frame_category(frame):
+    filename = frame.f_code.co_filename
+    if f'{os.sep}json{os.sep}' in filename or 'orjson' in filename:
+        return 'json'
+    if f'{os.sep}jinja2{os.sep}' in filename or filename.endswith('.html'):
+        return 'jinja'
+    if frame.f_code.co_name == 'api_request':
+        return 'api_request'
+    return None
+
+class StackSampler:
+    """Sample the stack of one thread at a fixed interval from a helper thread.
+
+    Samples are kept as collapsed stacks ('outer;inner;leaf' -> count), the
+    format read by flamegraph.pl and speedscope, and each sample is also
+    attributed to the innermost of JSON decoding, Jinja or api_request.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self.categories = dict.fromkeys(CATEGORIES, 0)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='stack-sampler')
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._sample(frame)
+
+    def _sample(self, frame):
+        labels = []
+        category = None
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            if category is None:
+                category = _frame_category(frame)
+            frame = frame.f_back
+        stack = ';'.join(reversed(labels))
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.categories[category or 'other'] += 1
+
+    @property
+    def sample_count(self):
+        return sum(self.stacks.values())
+
+    def write_collapsed(self, directory, name):
+        """Write the samples as a collapsed-stack file and return its path"""
+        os.makedirs(directory, exist_ok=True)
+        safe_name = ''.join(char if char.isalnum() or char in '-_' else '_' for char in name).strip('_') or 'root'
+        path = os.path.join(directory, f"{safe_name}-{int(time.time() * 1000)}-{os.getpid()}.collapsed")
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def summary(self):
+        """Share of samples attributed to each category"""
+        total = self.sample_count
+        return {category: round(count / total, 3) if total else 0.0 for category, count in self.categories.items()}
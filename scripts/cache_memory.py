@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Memory held per cached listing record, as full payloads and as view models.
+
+Fetches listing pages from the stub Ethnos API (or a real API with
+--api-url) and measures with tracemalloc what a parsed payload and its
+projection into view_models classes keep alive.
+
+    python scripts/cache_memory.py
+    python scripts/cache_memory.py --api-url http://localhost:3000 --limit 100
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+import requests
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPTS_DIR)
+
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, PROJECT_DIR)
+import fast_json
+from stub_api import add_stub_arguments, settings_from_args, start_stub_server
+from view_models import Course, Instructor, Organization, Person, Venue, Work, project_payload
+
+LISTINGS = [
+    ('/works', Work, 'data'),
+    ('/venues', Venue, 'data'),
+    ('/organizations', Organization, 'data'),
+    ('/persons', Person, 'data'),
+    ('/courses', Course, 'courses'),
+    ('/instructors', Instructor, 'instructors'),
+]
+
+def retained_bytes(build):
+    """Bytes still allocated after build() returns, with its result kept alive"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cache memory per listing record')
+    parser.add_argument('--api-url', help='Ethnos API base URL; by default a stub API is started')
+    parser.add_argument('--limit', type=int, default=50)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    api_url = args.api_url
+    if not api_url:
+        _, _, api_url = start_stub_server(settings_from_args(args))
+
+    print(f"{'listing':<16}{'records':>9}{'payload B/rec':>15}{'model B/rec':>13}{'saved':>8}")
+    for endpoint, model, key in LISTINGS:
+        raw = requests.get(f'{api_url}{endpoint}', params={'limit': args.limit, 'page': 1}, timeout=30).content
+        payload, full = retained_bytes(lambda: fast_json.loads(raw))
+        records = len(payload.get(key) or [])
+        if not records:
+            continue
+        _, slim = retained_bytes(lambda: project_payload(fast_json.loads(raw), model))
+        print(f"{endpoint:<16}{records:>9}{full // records:>15}{slim // records:>13}{1 - slim / full:>8.0%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""End-to-end load test of the Flask routes against the stub Ethnos API.
+
+Starts scripts/stub_api.py and the application in-process (or targets a
+running site with --target), drives a weighted mix of page requests at a
+fixed concurrency and reports p50/p95/p99, requests per second and
+upstream calls per page. Results can be saved as a baseline and later
+runs compared against it.
+
+    python scripts/loadtest.py --requests 2000 --concurrency 16
+    python scripts/loadtest.py --save-baseline
+    python scripts/loadtest.py --compare
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPTS_DIR)
+DEFAULT_BASELINE = os.path.join(SCRIPTS_DIR, 'baselines', 'loadtest.json')
+
+sys.path.insert(0, SCRIPTS_DIR)
+from stub_api import add_stub_arguments, settings_from_args, start_stub_server
+
+# (label, weight, path factory)
+SCENARIO = [
+    ('home', 10, lambda rng: '/'),
+    ('works_list', 12, lambda rng: f'/works?page={rng.randint(1, 5)}'),
+    ('works_detail', 20, lambda rng: f'/works/{rng.randint(1, 2000)}'),
+    ('search_results', 14, lambda rng: f"/search/results?q={rng.choice(['etnografia', 'ritual', 'parentesco', 'cultura'])}"),
+    ('search_live', 6, lambda rng: f"/search/live?q={rng.choice(['etnografia', 'ritual', 'território'])}"),
+    ('autocomplete', 10, lambda rng: f"/api/autocomplete?q={rng.choice(['an', 'ant', 'antr', 'et', 'etn'])}"),
+    ('venues_complete', 5, lambda rng: f'/venues/complete?page={rng.randint(1, 3)}'),
+    ('organizations_complete', 4, lambda rng: f'/organizations/complete?page={rng.randint(1, 3)}'),
+    ('venues_detail', 5, lambda rng: f'/venues/{rng.randint(1, 200)}'),
+    ('organizations_detail', 4, lambda rng: f'/organizations/{rng.randint(1, 200)}'),
+    ('person_works', 4, lambda rng: f'/person/{rng.randint(1, 500)}/works'),
+    ('ppgas', 2, lambda rng: '/ppgas'),
+    ('courses_ppgas', 2, lambda rng: '/courses/ppgas'),
+    ('instructors', 2, lambda rng: '/instructors'),
+]
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize(latencies):
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(values, 0.99) * 1000, 2)
+    }
+
+def start_app_server(api_base_url):
+    """Import the application against the stub API and serve it from a background thread"""
+    os.environ['API_BASE_URL'] = api_base_url
+    os.environ.setdefault('AUTOCOMPLETE_PREWARM', 'false')
+    sys.path.insert(0, PROJECT_DIR)
+    from werkzeug.serving import make_server
+    from app import app
+
+    app.logger.setLevel(logging.ERROR)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True, name='app-under-test').start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+def probe_upstream_calls(target, stub_state, seed):
+    """Request each route once, serially, and count the upstream calls it causes"""
+    rng = random.Random(seed)
+    calls = {}
+    session = requests.Session()
+    for label, _, make_path in SCENARIO:
+        before = stub_state.total_calls()
+        session.get(f'{target}{make_path(rng)}', timeout=60)
+        time.sleep(0.05)
+        calls[label] = stub_state.total_calls() - before
+    return calls
+
+def run_load(target, total_requests, concurrency, seed):
+    rng = random.Random(seed)
+    weights = [weight for _, weight, _ in SCENARIO]
+    plan = []
+    for _ in range(total_requests):
+        label, _, make_path = rng.choices(SCENARIO, weights=weights)[0]
+        plan.append((label, make_path(rng)))
+
+    local = threading.local()
+    results = []
+    results_lock = threading.Lock()
+
+    def fetch(item):
+        label, path = item
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            status = session.get(f'{target}{path}', timeout=60).status_code
+        except requests.RequestException:
+            status = 0
+        elapsed = time.perf_counter() - started
+        with results_lock:
+            results.append((label, status, elapsed))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(fetch, plan))
+    wall_time = time.perf_counter() - started
+    return results, wall_time
+
+def build_report(results, wall_time, upstream_calls, cold_calls, concurrency):
+    by_route = {}
+    for label, _, elapsed in results:
+        by_route.setdefault(label, []).append(elapsed)
+
+    errors = sum(1 for _, status, _ in results if status == 0 or status >= 500)
+    report = {
+        'concurrency': concurrency,
+        'requests': len(results),
+        'errors': errors,
+        'wall_time_s': round(wall_time, 3),
+        'rps': round(len(results) / wall_time, 2) if wall_time else 0.0,
+        'overall': summarize([elapsed for _, _, elapsed in results]),
+        'routes': {label: summarize(latencies) for label, latencies in sorted(by_route.items())}
+    }
+    if upstream_calls is not None:
+        report['upstream_calls_per_page'] = round(upstream_calls / max(len(results), 1), 3)
+        report['cold_upstream_calls'] = cold_calls
+    return report
+
+def compare(report, baseline, tolerance):
+    """Return human-readable regressions of the report relative to the baseline"""
+    regressions = []
+
+    def check(name, current, previous, higher_is_worse=True):
+        if not previous:
+            return
+        change = (current - previous) / previous
+        if (change if higher_is_worse else -change) > tolerance:
+            regressions.append(f"{name}: {previous} -> {current} ({change:+.1%})")
+
+    check('rps', report['rps'], baseline.get('rps'), higher_is_worse=False)
+    for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+        check(f'overall.{key}', report['overall'][key], baseline.get('overall', {}).get(key))
+    for label, stats in report['routes'].items():
+        previous = baseline.get('routes', {}).get(label, {})
+        check(f'{label}.p95_ms', stats['p95_ms'], previous.get('p95_ms'))
+    if 'upstream_calls_per_page' in report:
+        check('upstream_calls_per_page', report['upstream_calls_per_page'], baseline.get('upstream_calls_per_page'))
+    return regressions
+
+def print_report(report):
+    overall = report['overall']
+    print(f"requests={report['requests']} errors={report['errors']} concurrency={report['concurrency']} "
+          f"rps={report['rps']}")
+    print(f"overall p50={overall['p50_ms']}ms p95={overall['p95_ms']}ms p99={overall['p99_ms']}ms")
+    if 'upstream_calls_per_page' in report:
+        print(f"upstream calls per page: {report['upstream_calls_per_page']}")
+    print(f"{'route':<24}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'cold calls':>12}")
+    for label, stats in report['routes'].items():
+        cold = report.get('cold_upstream_calls', {}).get(label, '-')
+        print(f"{label:<24}{stats['count']:>7}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}{cold:>12}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the frontend against a stub Ethnos API')
+    parser.add_argument('--target', help='Base URL of a running site; by default the app is started in-process')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=100, help='Requests sent before measuring')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--compare', action='store_true', help='Fail when the run regresses past the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed relative regression')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    stub_state = None
+    if args.target:
+        target = args.target.rstrip('/')
+    else:
+        _, stub_state, api_base_url = start_stub_server(settings_from_args(args))
+        _, target = start_app_server(api_base_url)
+
+    cold_calls = probe_upstream_calls(target, stub_state, args.seed) if stub_state else None
+    if args.warmup:
+        run_load(target, args.warmup, args.concurrency, args.seed + 1)
+
+    if stub_state:
+        stub_state.reset()
+    results, wall_time = run_load(target, args.requests, args.concurrency, args.seed)
+    upstream_calls = stub_state.total_calls() if stub_state else None
+
+    report = build_report(results, wall_time, upstream_calls, cold_calls, args.concurrency)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif args.compare:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the per-item data-shaping functions in app.py.
+
+Drives the work ingest stage (normalize_works, including the pass over
+already-normalized cached records), filter_quality_results,
+build_pagination_info, format_batch_work, cache-key construction and JSON
+encoding and decoding (stdlib against fast_json) with large synthetic
+payloads, reporting items per second and allocated memory per round.
+Results are compared against a committed baseline to flag regressions.
+
+    python scripts/microbench.py
+    python scripts/microbench.py --compare
+    python scripts/microbench.py --save-baseline
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPTS_DIR)
+DEFAULT_BASELINE = os.path.join(SCRIPTS_DIR, 'baselines', 'microbench.json')
+
+os.environ.setdefault('AUTOCOMPLETE_PREWARM', 'false')
+os.environ.setdefault('METRICS_DIR', '')
+sys.path.insert(0, PROJECT_DIR)
+import app as ethnos_app
+import fast_json
+
+FIRST_NAMES = ['Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Felipe', 'Gabriela', 'Heitor', 'Isabel', 'João']
+LAST_NAMES = ['Silva', 'Souza', 'Oliveira', 'Pereira', 'Lima', 'Costa', 'Ribeiro', 'Almeida', 'Carvalho', 'Gomes']
+WORDS = ['antropologia', 'etnografia', 'cultura', 'ritual', 'parentesco', 'território', 'identidade', 'comunidade']
+
+def _name(rng):
+    return f"{rng.choice(LAST_NAMES)}, {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)[0]}."
+
+def _authors(rng):
+    return [_name(rng) for _ in range(rng.choice([0, 1, 1, 2, 3, 4, 6, 12]))]
+
+def search_works(rng, count):
+    """Works shaped like /search/works and /persons/{id}/works results"""
+    works = []
+    for work_id in range(count):
+        names = _authors(rng)
+        works.append({
+            'id': work_id,
+            'title': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 10))),
+            'authors': {'author_string': '; '.join(names)} if rng.random() < 0.8 else names,
+            'author_count': len(names),
+            'abstract': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 60))),
+            'publication_year': rng.choice([None, rng.randint(1950, 2025)]),
+            'doi': rng.choice([None, f'10.1590/{work_id}'])
+        })
+    return works
+
+def catalog_works(rng, count):
+    """Works shaped like /works listing items"""
+    return [{
+        'id': work_id,
+        'title': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 10))),
+        'authors': _authors(rng),
+        'authors_preview': _authors(rng)[:3],
+        'author_count': rng.randint(0, 12),
+        'year': rng.choice([None, rng.randint(1950, 2025)]),
+        'venue': {'id': rng.randint(1, 5000), 'name': f'Revista de {rng.choice(WORDS).title()}'}
+    } for work_id in range(count)]
+
+def detail_works(rng, count):
+    """Works shaped like /works/{id} detail payloads"""
+    works = []
+    for work_id in range(count):
+        names = _authors(rng)
+        works.append({
+            'id': work_id,
+            'title': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 10))),
+            'authors': [{'name': name, 'orcid': None, 'person_id': rng.randint(1, 550000),
+                         'affiliation': {'name': f'Universidade de {rng.choice(LAST_NAMES)}'}} for name in names],
+            'publication': {'year': rng.randint(1950, 2025), 'doi': f'10.1590/{work_id}'},
+            'venue': {'id': rng.randint(1, 5000), 'name': f'Revista de {rng.choice(WORDS).title()}'},
+            'publisher': {'name': f'Editora {rng.choice(LAST_NAMES)}'},
+            'work_type': 'ARTICLE',
+            'abstract': ' '.join(rng.choice(WORDS) for _ in range(80)),
+            'language': 'pt',
+            'identifiers': [{'type': 'doi', 'value': f'10.1590/{work_id}'}],
+            'metrics': {'citation_count': rng.randint(0, 200)}
+        })
+    return works
+
+def pagination_responses(rng, count):
+    return [(rng.choice([{}, {'total': rng.randint(0, 650000)},
+                         {'total': rng.randint(0, 650000), 'totalPages': rng.randint(1, 26000),
+                          'hasNext': True, 'hasPrev': False}]),
+             rng.randint(1, 50), rng.choice([20, 25, 50])) for _ in range(count)]
+
+def request_params(rng, count):
+    """Query parameter mappings like those passed to api_request"""
+    return [{'q': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))),
+             'page': rng.randint(1, 50), 'limit': rng.choice([20, 25, 50]),
+             'year_from': rng.choice([None, rng.randint(1950, 2025)]),
+             'sort': rng.choice(['relevance', 'year', 'title'])} for _ in range(count)]
+
+def encoded_works(rng, count):
+    return [json.dumps(work).encode() for work in detail_works(rng, count)]
+
+def legacy_cache_key(endpoint, params):
+    """Key format used before fast_json.canonical_key, kept for comparison"""
+    return f"{endpoint}:{json.dumps(params, sort_keys=True) if params else 'None'}"
+
+def _each(function):
+    def run(items):
+        return [function(item) for item in items]
+    return run
+
+BENCHMARKS = [
+    ('normalize_search_works', search_works, ethnos_app.normalize_works),
+    ('normalize_catalog_works', catalog_works, ethnos_app.normalize_works),
+    ('normalize_cached_works', lambda rng, count: ethnos_app.normalize_works(search_works(rng, count)),
+     ethnos_app.normalize_works),
+    ('filter_quality_results', search_works, ethnos_app.filter_quality_results),
+    ('build_pagination_info', pagination_responses,
+     lambda items: [ethnos_app.build_pagination_info(*item) for item in items]),
+    ('format_batch_work', detail_works, _each(ethnos_app.format_batch_work)),
+    ('cache_key_stdlib', request_params, _each(lambda params: legacy_cache_key('/search/works', params))),
+    ('cache_key_canonical', request_params, _each(lambda params: ethnos_app._api_cache_key('/search/works', params))),
+    ('jsonify_stdlib', detail_works, lambda works: json.dumps({'works': works, 'total': len(works)})),
+    ('jsonify_fast', detail_works,
+     lambda works: ethnos_app.app.json.dumps({'works': works, 'total': len(works)})),
+    ('decode_stdlib', encoded_works, _each(json.loads)),
+    ('decode_fast', encoded_works, _each(fast_json.loads)),
+]
+
+def run_benchmark(make_input, function, items, rounds, seed):
+    """Time `rounds` calls on fresh copies of the input and measure allocations of one call"""
+    template = make_input(random.Random(seed), items)
+    timings = []
+    for _ in range(rounds):
+        data = copy.deepcopy(template)
+        started = time.perf_counter()
+        function(data)
+        timings.append(time.perf_counter() - started)
+
+    data = copy.deepcopy(template)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    function(data)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        'items': items,
+        'ops_per_sec': round(items / best, 1),
+        'best_ms': round(best * 1000, 3),
+        'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+        'alloc_peak_kb': round((peak - before) / 1024, 1),
+        'alloc_retained_kb': round((after - before) / 1024, 1)
+    }
+
+def compare(results, baseline, tolerance):
+    """Regressions against the baseline; a benchmark missing from the baseline counts as one"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            regressions.append(f"{name}: no baseline entry (re-run with --save-baseline)")
+            continue
+        if current['ops_per_sec'] < previous['ops_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: ops/sec {previous['ops_per_sec']} -> {current['ops_per_sec']}")
+        if previous['alloc_peak_kb'] and current['alloc_peak_kb'] > previous['alloc_peak_kb'] * (1 + tolerance):
+            regressions.append(f"{name}: alloc peak {previous['alloc_peak_kb']}KB -> {current['alloc_peak_kb']}KB")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmarks for app.py data-shaping functions')
+    parser.add_argument('--items', type=int, default=5000, help='Synthetic records per round')
+    parser.add_argument('--rounds', type=int, default=15)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--only', action='append', help='Run only the named benchmark (repeatable)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--compare', action='store_true', help='Fail when a benchmark regresses past the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative regression')
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'benchmark':<26}{'items/s':>14}{'best ms':>10}{'mean ms':>10}{'peak KB':>10}{'kept KB':>10}")
+    for name, make_input, function in BENCHMARKS:
+        if args.only and name not in args.only:
+            continue
+        result = results[name] = run_benchmark(make_input, function, args.items, args.rounds, args.seed)
+        print(f"{name:<26}{result['ops_per_sec']:>14}{result['best_ms']:>10}{result['mean_ms']:>10}"
+              f"{result['alloc_peak_kb']:>10}{result['alloc_retained_kb']:>10}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif args.compare:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+if __name__ == '__main__':
+    main()
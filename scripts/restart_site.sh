@@ -41,7 +41,7 @@ pip install -q -r requirements.txt
 
 if [ "$MODE" = "prod" ]; then
     echo "Iniciando servidor Gunicorn na porta $PORT..."
-    venv/bin/gunicorn --bind 0.0.0.0:$PORT --workers 4 --daemon --pid /tmp/antropoteca_new.pid --access-logfile /tmp/antropoteca_new-access.log --error-logfile /tmp/antropoteca_new-error.log app:app
+    venv/bin/gunicorn --config gunicorn.conf.py --bind 0.0.0.0:$PORT --workers 4 --daemon --pid /tmp/antropoteca_new.pid --access-logfile /tmp/antropoteca_new-access.log --error-logfile /tmp/antropoteca_new-error.log app:app
 else
     echo "Iniciando servidor Flask na porta $PORT..."
     python app.py &
@@ -53,6 +53,8 @@ if curl -s http://127.0.0.1:$PORT/ > /dev/null; then
     echo "Site iniciado com sucesso!"
     echo "Acesse: http://127.0.0.1:$PORT/"
     if [ "$MODE" = "prod" ]; then
+        echo "Aquecendo cache dos workers..."
+        flask --app app warm-cache --url http://127.0.0.1:$PORT --passes 4 > /dev/null || echo "Aviso: aquecimento de cache incompleto"
         echo "Processo PID: $(cat /tmp/antropoteca_new.pid 2>/dev/null || echo 'N/A')"
         echo "Logs: /tmp/antropoteca_new-access.log | /tmp/antropoteca_new-error.log"
     else
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Local stub of the Ethnos API for load testing the frontend.
+
+Serves synthetic payloads shaped like the endpoints app.py uses, with
+configurable latency, error rate and payload size. Counts every request
+so the load driver can report upstream calls per page.
+
+    python scripts/stub_api.py --port 3000 --latency-ms 40 --error-rate 0.01
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIRST_NAMES = ['Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Felipe', 'Gabriela', 'Heitor', 'Isabel', 'João']
+LAST_NAMES = ['Silva', 'Souza', 'Oliveira', 'Pereira', 'Lima', 'Costa', 'Ribeiro', 'Almeida', 'Carvalho', 'Gomes']
+TITLE_WORDS = ['antropologia', 'etnografia', 'cultura', 'ritual', 'parentesco', 'território', 'identidade',
+               'comunidade', 'religião', 'política', 'memória', 'corpo', 'gênero', 'cidade', 'povos']
+
+class StubSettings:
+    def __init__(self, latency_ms=30.0, latency_sigma=0.5, error_rate=0.0, page_size=25,
+                 abstract_chars=600, authors_per_work=4, total_works=650000, seed=1):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.page_size = page_size
+        self.abstract_chars = abstract_chars
+        self.authors_per_work = authors_per_work
+        self.total_works = total_works
+        self.seed = seed
+
+class StubState:
+    def __init__(self, settings):
+        self.settings = settings
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def record(self, route):
+        with self.lock:
+            self.calls[route] = self.calls.get(route, 0) + 1
+
+    def total_calls(self):
+        with self.lock:
+            return sum(self.calls.values())
+
+    def reset(self):
+        with self.lock:
+            self.calls = {}
+
+def _rng(*parts):
+    return random.Random('|'.join(str(part) for part in parts))
+
+def _person_name(rng):
+    return f"{rng.choice(LAST_NAMES)}, {rng.choice(FIRST_NAMES)}"
+
+def _title(rng):
+    return ' '.join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(3, 9))).capitalize()
+
+def work_summary(settings, work_id):
+    rng = _rng('work', work_id)
+    authors = [_person_name(rng) for _ in range(rng.randint(1, settings.authors_per_work))]
+    return {
+        'id': work_id,
+        'title': _title(rng),
+        'authors': authors,
+        'authors_preview': authors[:3],
+        'author_count': len(authors),
+        'year': rng.randint(1950, 2025),
+        'publication_year': rng.randint(1950, 2025),
+        'work_type': rng.choice(['ARTICLE', 'BOOK', 'CHAPTER']),
+        'doi': f'10.{rng.randint(1000, 9999)}/{work_id}',
+        'abstract': ' '.join(rng.choice(TITLE_WORDS) for _ in range(settings.abstract_chars // 10)),
+        'venue': {'id': rng.randint(1, 5000), 'name': f'Revista de {rng.choice(TITLE_WORDS).title()}'}
+    }
+
+def work_detail(settings, work_id):
+    rng = _rng('detail', work_id)
+    summary = work_summary(settings, work_id)
+    summary['authors'] = [{
+        'name': name,
+        'person_id': rng.randint(1, 550000),
+        'orcid': None,
+        'role': 'AUTHOR',
+        'affiliation': {'name': f'Universidade de {rng.choice(LAST_NAMES)}'}
+    } for name in summary['authors']]
+    summary['publication'] = {'year': summary['year'], 'doi': summary['doi'], 'open_access': rng.random() < 0.3}
+    summary['identifiers'] = [{'type': 'doi', 'value': summary['doi']}]
+    summary['files'] = []
+    summary['language'] = 'pt'
+    return summary
+
+def venue(settings, venue_id):
+    rng = _rng('venue', venue_id)
+    return {
+        'id': venue_id,
+        'name': f'Revista de {rng.choice(TITLE_WORDS).title()} {venue_id}',
+        'type': 'JOURNAL',
+        'works_count': rng.randint(0, 3000),
+        'publisher_name': f'Editora {rng.choice(LAST_NAMES)}',
+        'issn': f'{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}'
+    }
+
+def organization(settings, org_id):
+    rng = _rng('org', org_id)
+    return {
+        'id': org_id,
+        'name': f'Universidade Federal de {rng.choice(LAST_NAMES)} {org_id}',
+        'type': 'UNIVERSITY',
+        'location': {'country_code': 'BR'},
+        'metrics': {'affiliated_authors_count': rng.randint(0, 800), 'works_count': rng.randint(0, 9000)},
+        'identifiers': {'ror_id': f'0{org_id:08d}'},
+        'top_authors': [],
+        'recent_works': []
+    }
+
+def person(settings, person_id):
+    rng = _rng('person', person_id)
+    return {
+        'id': person_id,
+        'preferred_name': _person_name(rng),
+        'metrics': {'works_count': rng.randint(1, 120)}
+    }
+
+def course(settings, course_id):
+    rng = _rng('course', course_id)
+    return {
+        'id': course_id,
+        'name': f'Tópicos em {rng.choice(TITLE_WORDS).title()}',
+        'code': f'MNA{course_id:04d}',
+        'year': rng.randint(2000, 2025),
+        'semester': rng.choice([1, 2]),
+        'credits': 4,
+        'instructor_count': 2,
+        'bibliography_count': 20,
+        'program_id': 1
+    }
+
+def instructor(settings, person_id):
+    rng = _rng('instructor', person_id)
+    return {
+        'person_id': person_id,
+        'preferred_name': _person_name(rng),
+        'courses_taught': rng.randint(1, 40),
+        'earliest_year': rng.randint(1980, 2000),
+        'latest_year': rng.randint(2001, 2025)
+    }
+
+def paginate(settings, params, total, make_item, id_offset=1):
+    page = int(params.get('page', 1))
+    limit = int(params.get('limit', settings.page_size))
+    if 'offset' in params:
+        page = int(params['offset']) // max(limit, 1) + 1
+    start = (page - 1) * limit
+    items = [make_item(settings, id_offset + start + index) for index in range(max(0, min(limit, total - start)))]
+    total_pages = max(1, (total + limit - 1) // limit)
+    return items, {
+        'page': page,
+        'limit': limit,
+        'offset': start,
+        'total': total,
+        'totalPages': total_pages,
+        'hasNext': page < total_pages,
+        'hasPrev': page > 1
+    }
+
+def _listing(settings, params, total, make_item, key='data'):
+    items, pagination = paginate(settings, params, total, make_item)
+    return {key: items, 'pagination': pagination}
+
+def _search(settings, params):
+    rng = _rng('search', params.get('q', ''))
+    total = rng.randint(0, 5000)
+    items, pagination = paginate(settings, params, total,
+                                 lambda s, index: work_summary(s, rng.randint(1, s.total_works)))
+    return {'data': items, 'pagination': pagination}
+
+ROUTES = [
+    (r'/works', lambda s, m, p: _listing(s, p, s.total_works, work_summary)),
+    (r'/works/(\d+)', lambda s, m, p: {'data': work_detail(s, int(m[1]))}),
+    (r'/works/(\d+)/metrics', lambda s, m, p: {'data': {'citation_count': int(m[1]) % 50}}),
+    (r'/works/(\d+)/references', lambda s, m, p: {'data': {'referenced_works': [
+        {'cited_work_id': int(m[1]) + index, 'title': work_summary(s, int(m[1]) + index)['title'], 'year': 2000}
+        for index in range(1, 1 + int(m[1]) % 6)]}}),
+    (r'/search/works', lambda s, m, p: _search(s, p)),
+    (r'/search/sphinx', lambda s, m, p: (lambda result: {'data': {
+        'results': result['data'], 'total': result['pagination']['total'], 'meta': {'query_time_ms': 5}}})(_search(s, p))),
+    (r'/search/autocomplete', lambda s, m, p: {'data': {'suggestions': [
+        {'text': f"{p.get('q', '')}{word}", 'type': 'term', 'work_count': len(word)}
+        for word in TITLE_WORDS[:_rng('ac', p.get('q', '')).randint(0, 25)]]}}),
+    (r'/venues', lambda s, m, p: _listing(s, p, 4945, venue)),
+    (r'/venues/statistics', lambda s, m, p: {'data': {'total_venues': 4945, 'journals': 4300}}),
+    (r'/venues/(\d+)', lambda s, m, p: {'data': venue(s, int(m[1]))}),
+    (r'/venues/(\d+)/works', lambda s, m, p: _listing(s, p, venue(s, int(m[1]))['works_count'], work_summary)),
+    (r'/persons', lambda s, m, p: _listing(s, p, 549480, person)),
+    (r'/persons/(\d+)', lambda s, m, p: {'data': person(s, int(m[1]))}),
+    (r'/persons/(\d+)/works', lambda s, m, p: _listing(s, p, person(s, int(m[1]))['metrics']['works_count'], work_summary)),
+    (r'/organizations', lambda s, m, p: _listing(s, p, 182170, organization)),
+    (r'/organizations/(\d+)', lambda s, m, p: {'data': organization(s, int(m[1]))}),
+    (r'/organizations/(\d+)/works', lambda s, m, p: _listing(s, p, organization(s, int(m[1]))['metrics']['works_count'], work_summary)),
+    (r'/signatures/(\d+)', lambda s, m, p: {'data': {'id': int(m[1]), 'signature': person(s, int(m[1]))['preferred_name']}}),
+    (r'/signatures/(\d+)/works', lambda s, m, p: _listing(s, p, 30, work_summary)),
+    (r'/courses', lambda s, m, p: _listing(s, p, 420, course, key='courses')),
+    (r'/courses/statistics', lambda s, m, p: {'total_courses': 420, 'total_instructors': 85}),
+    (r'/courses/(\d+)', lambda s, m, p: dict(course(s, int(m[1])), bibliography=[
+        work_summary(s, int(m[1]) * 100 + index) for index in range(20)], instructors=[], subjects=[])),
+    (r'/instructors', lambda s, m, p: _listing(s, p, 85, instructor, key='instructors')),
+    (r'/instructors/statistics', lambda s, m, p: {'total_instructors': 85}),
+    (r'/instructors/(\d+)/statistics', lambda s, m, p: {
+        'person': {'id': int(m[1]), 'preferred_name': instructor(s, int(m[1]))['preferred_name']},
+        'teaching_profile': {'courses_taught': 12}, 'authorship_profile': {'works_authored': 30},
+        'recent_authored_works': [work_summary(s, int(m[1]) + index) for index in range(10)]}),
+    (r'/instructors/(\d+)/courses', lambda s, m, p: [course(s, int(m[1]) + index) for index in range(5)]),
+    (r'/metrics/annual', lambda s, m, p: {'total_works': s.total_works, 'year': 2025}),
+]
+
+COMPILED_ROUTES = [(re.compile(f'^{pattern}$'), pattern, handler) for pattern, handler in ROUTES]
+
+def make_handler(state):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            settings = state.settings
+            parsed = urlparse(self.path)
+            params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+
+            for regex, pattern, handler in COMPILED_ROUTES:
+                match = regex.match(parsed.path)
+                if match:
+                    break
+            else:
+                state.record('unknown')
+                self._send(404, {'status': 'error', 'message': 'Not found'})
+                return
+
+            state.record(pattern)
+            if settings.latency_ms > 0:
+                delay = random.lognormvariate(0, settings.latency_sigma) * settings.latency_ms / 1000
+                time.sleep(delay)
+            if settings.error_rate and random.random() < settings.error_rate:
+                self._send(500, {'status': 'error', 'message': 'Injected failure'})
+                return
+            self._send(200, handler(settings, match, params))
+
+    return StubHandler
+
+def start_stub_server(settings, host='127.0.0.1', port=0):
+    """Start the stub API in a background thread and return (server, state, base_url)"""
+    random.seed(settings.seed)
+    state = StubState(settings)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name='stub-api').start()
+    return server, state, f'http://{host}:{server.server_address[1]}'
+
+def add_stub_arguments(parser):
+    parser.add_argument('--latency-ms', type=float, default=30.0, help='Median upstream latency in ms')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='Log-normal spread of the latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with HTTP 500')
+    parser.add_argument('--page-size', type=int, default=25, help='Default page size of listings')
+    parser.add_argument('--abstract-chars', type=int, default=600, help='Approximate abstract length per work')
+    parser.add_argument('--authors-per-work', type=int, default=4, help='Maximum authors per synthetic work')
+    parser.add_argument('--seed', type=int, default=1)
+
+def settings_from_args(args):
+    return StubSettings(latency_ms=args.latency_ms, latency_sigma=args.latency_sigma, error_rate=args.error_rate,
+                        page_size=args.page_size, abstract_chars=args.abstract_chars,
+                        authors_per_work=args.authors_per_work, seed=args.seed)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local stub of the Ethnos API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server, state, base_url = start_stub_server(settings_from_args(args), args.host, args.port)
+    print(f"Stub Ethnos API listening on {base_url}")
+    try:
+        while True:
+            time.sleep(60)
+            print(f"{state.total_calls()} requests served")
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,195 @@
+import gzip
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+import fast_json
+
+URLSET_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_FOOTER = '</urlset>\n'
+
+def _lastmod(timestamp):
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+class SitemapBuilder:
+    """Gzipped sitemap files for paginated catalog listings, and the sitemap index over them.
+
+    Each listing is read through `fetch(endpoint, params)` page by page with
+    up to `concurrency` pages in flight, and its URLs are streamed into
+    `<source>-<n>.xml.gz` files of at most `urls_per_file` URLs, so memory
+    stays flat however large the catalog is. File n always covers the same
+    run of upstream pages, so files that were filled on an earlier run are
+    kept and a refresh resumes from the first one that was not. A file whose
+    URLs did not change keeps its lastmod in the index.
+    """
+
+    STATE_FILE = 'sitemap-state.json'
+    INDEX_FILE = 'sitemap.xml'
+
+    def __init__(self, directory, base_url, fetch, page_size=100, urls_per_file=50000, concurrency=4, log=None):
+        self.directory = directory
+        self.base_url = base_url.rstrip('/')
+        self.fetch = fetch
+        self.page_size = page_size
+        self.pages_per_file = max(1, urls_per_file // page_size)
+        self.concurrency = max(1, concurrency)
+        self.log = log
+        self.state_path = os.path.join(directory, self.STATE_FILE)
+        self.state = self._load()
+
+    def build(self, sources, full=False):
+        """Refresh the files of each source, given as {name: (listing endpoint, URL template)}, and the index"""
+        os.makedirs(self.directory, exist_ok=True)
+        summaries = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='sitemap') as executor:
+            for name, (endpoint, url_template) in sources.items():
+                summaries[name] = self._build_source(executor, name, endpoint, url_template, full)
+                self._save()
+                self._write_index()
+        return summaries
+
+    def _build_source(self, executor, name, endpoint, url_template, full):
+        started = time.time()
+        previous = self.state.get(name, [])
+        kept = 0
+        while not full and kept < len(previous) and previous[kept]['complete']:
+            kept += 1
+        first_page = kept * self.pages_per_file + 1
+
+        files = previous[:kept]
+        written = 0
+        pages = self._pages(executor, endpoint, first_page)
+        try:
+            while True:
+                number = len(files) + 1
+                entry, exhausted, failed = self._write_file(name, number, url_template, pages,
+                                                            previous[number - 1] if number <= len(previous) else None)
+                if entry:
+                    files.append(entry)
+                    written += 1
+                if exhausted or failed or not entry:
+                    break
+        finally:
+            pages.close()
+
+        if failed:
+            # Keep the files past the failure point from the last run rather than dropping their URLs
+            files += previous[len(files):]
+        else:
+            for stale in previous[len(files):]:
+                self._remove(stale['name'])
+        self.state[name] = files
+
+        summary = {
+            'files': len(files),
+            'written': written,
+            'urls': sum(entry['urls'] for entry in files),
+            'resumed_from_page': first_page,
+            'complete': not failed,
+            'duration_s': round(time.time() - started, 1)
+        }
+        if self.log and failed:
+            self.log.warning('sitemap.source_incomplete', source=name, **summary)
+        elif self.log:
+            self.log.info('sitemap.source_built', source=name, **summary)
+        return summary
+
+    def _write_file(self, source, number, url_template, pages, previous):
+        """Stream the next run of pages into one file; returns (entry or None, listing exhausted, fetch failed)"""
+        file_name = f"{source}-{number}.xml.gz"
+        path = os.path.join(self.directory, file_name)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        digest = hashlib.blake2b(digest_size=16)
+        urls = 0
+        filled = exhausted = failed = False
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            f.write(URLSET_HEADER)
+            for _ in range(self.pages_per_file):
+                records = next(pages)
+                if records is None:
+                    failed = True
+                    break
+                chunk = ''.join(f"<url><loc>{escape(self.base_url + url_template.format(id=record['id']))}</loc></url>\n"
+                                for record in records if record.get('id') is not None)
+                f.write(chunk)
+                digest.update(chunk.encode('utf-8'))
+                urls += chunk.count('<url>')
+                if len(records) < self.page_size:
+                    exhausted = True
+                    break
+            else:
+                filled = True
+            f.write(URLSET_FOOTER)
+
+        # A partial rewrite would lose URLs the file had on the last run, so that copy is kept instead
+        if not urls or (failed and previous):
+            os.remove(temp_path)
+            return None, exhausted, failed
+        os.replace(temp_path, path)
+        digest = digest.hexdigest()
+        unchanged = bool(previous) and previous.get('name') == file_name and previous.get('digest') == digest
+        return {
+            'name': file_name,
+            'urls': urls,
+            'complete': filled,
+            'digest': digest,
+            'lastmod': previous['lastmod'] if unchanged else time.time()
+        }, exhausted, failed
+
+    def _pages(self, executor, endpoint, first_page):
+        """Yield the records of each page from first_page on, in order, or None for a page that failed"""
+        pending = {}
+        page = first_page
+        try:
+            while True:
+                for ahead in range(page, page + self.concurrency):
+                    if ahead not in pending:
+                        pending[ahead] = executor.submit(self._fetch_page, endpoint, ahead)
+                yield pending.pop(page).result()
+                page += 1
+        finally:
+            for future in pending.values():
+                future.cancel()
+
+    def _fetch_page(self, endpoint, page):
+        response = self.fetch(endpoint, {'page': page, 'limit': self.page_size})
+        records = response.get('data') if response else None
+        return records if isinstance(records, list) else None
+
+    def _write_index(self):
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+            for files in self.state.values():
+                for entry in files:
+                    f.write(f"<sitemap><loc>{escape(self.base_url)}/sitemaps/{entry['name']}</loc>"
+                            f"<lastmod>{_lastmod(entry['lastmod'])}</lastmod></sitemap>\n")
+            f.write('</sitemapindex>\n')
+        os.replace(temp_path, path)
+
+    def _remove(self, file_name):
+        try:
+            os.remove(os.path.join(self.directory, file_name))
+        except FileNotFoundError:
+            pass
+
+    def _load(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'rb') as f:
+                return fast_json.loads(f.read())
+        except (OSError, ValueError) as e:
+            if self.log:
+                self.log.warning('sitemap.state_load_failed', path=self.state_path, error=e)
+            return {}
+
+    def _save(self):
+        temp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(fast_json.dumps(self.state))
+        os.replace(temp_path, self.state_path)
@@ -2,12 +2,121 @@
  * ethnos_app API Client - Development Version
  * Handles all communication with the ethnos_app API backend
  */
+/**
+ * Persistent store of API responses in IndexedDB, shared across page loads.
+ * Entries are evicted least recently used first beyond maxEntries. Every
+ * operation resolves to null instead of failing when IndexedDB is
+ * unavailable (private browsing, blocked storage), so callers fall back to
+ * the network.
+ */
+class PersistentAPICache {
+    constructor(dbName = 'ethnos_app_api', maxEntries = 500) {
+        this.dbName = dbName;
+        this.storeName = 'responses';
+        this.maxEntries = maxEntries;
+        this.dbPromise = null;
+    }
+
+    /**
+     * Open the database once, creating the store on first use
+     */
+    _open() {
+        if (!this.dbPromise) {
+            this.dbPromise = new Promise(resolve => {
+                if (typeof indexedDB === 'undefined') {
+                    resolve(null);
+                    return;
+                }
+                const request = indexedDB.open(this.dbName, 1);
+                request.onupgradeneeded = () => {
+                    const store = request.result.createObjectStore(this.storeName, { keyPath: 'key' });
+                    store.createIndex('accessed', 'accessed');
+                };
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => resolve(null);
+                request.onblocked = () => resolve(null);
+            }).catch(() => null);
+        }
+        return this.dbPromise;
+    }
+
+    /**
+     * Run an operation in a transaction, resolving to its request's result once committed
+     */
+    async _run(mode, operation) {
+        const db = await this._open();
+        if (!db) {
+            return null;
+        }
+
+        return new Promise(resolve => {
+            try {
+                const transaction = db.transaction(this.storeName, mode);
+                const request = operation(transaction.objectStore(this.storeName));
+                transaction.oncomplete = () => resolve(request && request.result !== undefined ? request.result : null);
+                transaction.onerror = () => resolve(null);
+                transaction.onabort = () => resolve(null);
+            } catch (error) {
+                resolve(null);
+            }
+        });
+    }
+
+    get(key) {
+        return this._run('readonly', store => store.get(key));
+    }
+
+    /**
+     * Store an entry and evict the least recently used ones beyond maxEntries
+     */
+    set(entry) {
+        return this._run('readwrite', store => {
+            store.put(entry);
+            const countRequest = store.count();
+            countRequest.onsuccess = () => {
+                let excess = countRequest.result - this.maxEntries;
+                if (excess <= 0) {
+                    return;
+                }
+                store.index('accessed').openCursor().onsuccess = event => {
+                    const cursor = event.target.result;
+                    if (cursor && excess-- > 0) {
+                        cursor.delete();
+                        cursor.continue();
+                    }
+                };
+            };
+        });
+    }
+
+    /**
+     * Mark an entry as just used so LRU eviction keeps it
+     */
+    touch(key) {
+        return this._run('readwrite', store => {
+            const request = store.get(key);
+            request.onsuccess = () => {
+                if (request.result) {
+                    store.put({ ...request.result, accessed: Date.now() });
+                }
+            };
+        });
+    }
+
+    clear() {
+        return this._run('readwrite', store => store.clear());
+    }
+}
+
 class ethnos_appAPI {
     constructor() {
         this.baseURL = '/api/v2';
         this.cache = new Map();
         this.cacheTimeout = 300000; // 5 minutes
+        this.maxMemoryEntries = 100;
         this.requestTimeout = 15000; // 15 seconds
+        this.inflight = new Map();
+        this.persistentCache = new PersistentAPICache();
     }
 
     /**
@@ -25,17 +134,65 @@ class ethnos_appAPI {
     }
 
     /**
-     * Main fetch method with caching, retries, and error handling
+     * Main fetch method with caching, request deduplication, retries, and error handling
+     *
+     * GET responses are cached in memory and in IndexedDB. Fresh entries are
+     * returned without a request; expired ones with an ETag are revalidated
+     * with If-None-Match and reused on a 304. Identical calls made while one
+     * is in flight share its promise.
      */
     async _fetch(endpoint, options = {}, retryCount = 2) {
+        if (options.method && options.method.toUpperCase() !== 'GET') {
+            return (await this._request(endpoint, options, retryCount)).data;
+        }
+
         const cacheKey = this._getCacheKey(endpoint, options);
-        const cachedEntry = this.cache.get(cacheKey);
+        const cachedEntry = this._getMemoryEntry(cacheKey);
 
         // Return cached data if valid
         if (this._isValidCacheEntry(cachedEntry)) {
             return cachedEntry.data;
         }
 
+        if (this.inflight.has(cacheKey)) {
+            return this.inflight.get(cacheKey);
+        }
+
+        const pending = this._load(endpoint, options, retryCount, cacheKey, cachedEntry)
+            .finally(() => this.inflight.delete(cacheKey));
+        this.inflight.set(cacheKey, pending);
+        return pending;
+    }
+
+    /**
+     * Answer from the persistent cache or the network, revalidating expired entries by ETag
+     */
+    async _load(endpoint, options, retryCount, cacheKey, cachedEntry) {
+        const storedEntry = cachedEntry || await this.persistentCache.get(cacheKey);
+
+        if (this._isValidCacheEntry(storedEntry)) {
+            this._remember(cacheKey, storedEntry);
+            this.persistentCache.touch(cacheKey);
+            return storedEntry.data;
+        }
+
+        const etag = storedEntry ? storedEntry.etag : null;
+        const result = await this._request(endpoint, options, retryCount, etag);
+        const now = Date.now();
+
+        if (result.notModified) {
+            this._store({ ...storedEntry, timestamp: now, accessed: now });
+            return storedEntry.data;
+        }
+
+        this._store({ key: cacheKey, data: result.data, etag: result.etag, timestamp: now, accessed: now });
+        return result.data;
+    }
+
+    /**
+     * Request an endpoint with retries; resolves to { data, etag } or { notModified: true } on a 304
+     */
+    async _request(endpoint, options = {}, retryCount = 2, etag = null) {
         let lastError;
         const maxAttempts = retryCount + 1;
 
@@ -50,6 +207,7 @@ class ethnos_appAPI {
                     signal: controller.signal,
                     headers: {
                         'Content-Type': 'application/json',
+                        ...(etag ? { 'If-None-Match': etag } : {}),
                         ...options.headers
                     }
                 };
@@ -58,6 +216,10 @@ class ethnos_appAPI {
                 const response = await fetch(`${this.baseURL}${endpoint}`, fetchOptions);
                 clearTimeout(timeoutId);
 
+                if (response.status === 304 && etag) {
+                    return { notModified: true };
+                }
+
                 if (!response.ok) {
                     throw new Error(`API Error: ${response.status} ${response.statusText}`);
                 }
@@ -69,18 +231,7 @@ class ethnos_appAPI {
                     throw new Error(data.error || 'API returned error status');
                 }
 
-                // Cache successful response
-                this.cache.set(cacheKey, {
-                    data: data,
-                    timestamp: Date.now()
-                });
-
-                // Clean cache if it gets too large
-                if (this.cache.size > 100) {
-                    this._cleanCache();
-                }
-
-                return data;
+                return { data: data, etag: response.headers.get('ETag') };
 
             } catch (error) {
                 lastError = error;
@@ -111,15 +262,34 @@ class ethnos_appAPI {
     }
 
     /**
-     * Clean expired entries from cache
+     * Read a memory cache entry, marking it as most recently used
      */
-    _cleanCache() {
-        const now = Date.now();
-        for (const [key, entry] of this.cache.entries()) {
-            if (now - entry.timestamp > this.cacheTimeout) {
-                this.cache.delete(key);
-            }
+    _getMemoryEntry(cacheKey) {
+        const entry = this.cache.get(cacheKey);
+        if (entry) {
+            this.cache.delete(cacheKey);
+            this.cache.set(cacheKey, entry);
         }
+        return entry;
+    }
+
+    /**
+     * Keep an entry in the memory cache, evicting the least recently used beyond maxMemoryEntries
+     */
+    _remember(cacheKey, entry) {
+        this.cache.delete(cacheKey);
+        this.cache.set(cacheKey, entry);
+        while (this.cache.size > this.maxMemoryEntries) {
+            this.cache.delete(this.cache.keys().next().value);
+        }
+    }
+
+    /**
+     * Cache a response in memory and in IndexedDB
+     */
+    _store(entry) {
+        this._remember(entry.key, entry);
+        this.persistentCache.set(entry);
     }
 
     /**
@@ -127,6 +297,7 @@ class ethnos_appAPI {
      */
     clearCache() {
         this.cache.clear();
+        return this.persistentCache.clear();
     }
 
     // API Methods
@@ -0,0 +1,98 @@
+import hashlib
+import os
+import threading
+import time
+
+import fast_json
+
+class StaticExporter:
+    """Rendered pages kept under `directory` as `<path>/index.html`, rewritten only when their HTML changes.
+
+    A manifest beside the pages keeps, for every exported page, its digest,
+    when it was last rendered, whether rendering it called the API and the
+    version of the local data it was rendered from. `is_fresh` uses that to
+    skip rendering a page again, and a page that is rendered is compared
+    against its digest instead of reading the file back, leaving unchanged
+    files (and their mtimes) alone. Files are replaced atomically, so nginx
+    never serves a half-written page.
+    """
+
+    MANIFEST = '.export-manifest.json'
+
+    def __init__(self, directory, log=None):
+        self.directory = directory
+        self.log = log
+        self.manifest_path = os.path.join(directory, self.MANIFEST)
+        self.pages = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def file_path(self, path):
+        parts = [part for part in path.split('/') if part]
+        if any(part in ('.', '..') for part in parts):
+            raise ValueError(f"Unsafe export path: {path}")
+        return os.path.join(self.directory, *parts, 'index.html')
+
+    def is_fresh(self, path, source_version, max_age):
+        """Whether the page for `path` can be kept without rendering it again"""
+        page = self.pages.get(path)
+        if not page or not os.path.exists(self.file_path(path)):
+            return False
+        if page['upstream']:
+            return time.time() - page['rendered_at'] < max_age
+        return page['source_version'] == source_version
+
+    def write(self, path, body, upstream, source_version, force=False):
+        """Write the page for `path` unless it is unchanged; returns 'written' or 'unchanged'"""
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        file_path = self.file_path(path)
+        page = {'digest': digest, 'rendered_at': time.time(), 'upstream': upstream, 'source_version': source_version}
+        previous = self.pages.get(path)
+        if not force and previous and previous['digest'] == digest and os.path.exists(file_path):
+            with self._lock:
+                self.pages[path] = page
+            return 'unchanged'
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(body)
+        os.replace(temp_path, file_path)
+        with self._lock:
+            self.pages[path] = page
+        return 'written'
+
+    def remove(self, path):
+        """Delete the page for `path`; returns 'removed' or 'absent'"""
+        with self._lock:
+            self.pages.pop(path, None)
+        try:
+            os.remove(self.file_path(path))
+        except FileNotFoundError:
+            return 'absent'
+        return 'removed'
+
+    def prune(self, keep):
+        """Delete exported pages whose path is not in `keep`; returns the deleted paths"""
+        stale = [path for path in list(self.pages) if path not in keep]
+        for path in stale:
+            self.remove(path)
+        return stale
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with self._lock:
+            manifest = fast_json.dumps(self.pages)
+        with open(temp_path, 'w') as f:
+            f.write(manifest)
+        os.replace(temp_path, self.manifest_path)
+
+    def _load(self):
+        if not os.path.exists(self.manifest_path):
+            return
+        try:
+            with open(self.manifest_path, 'rb') as f:
+                self.pages = fast_json.loads(f.read())
+        except (OSError, ValueError) as e:
+            if self.log:
+                self.log.warning('export.manifest_load_failed', path=self.manifest_path, error=e)
@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+
+import fast_json
+
+class StatsSnapshot:
+    """Aggregate statistics refreshed in the background and read without touching the API.
+
+    Each source is a callable returning the current value, or None when it
+    could not be fetched; a source that fails keeps its last good value. The
+    snapshot is saved to `path` after every refresh and loaded from it on
+    start, so a restarted worker serves the previous numbers until its first
+    refresh completes.
+    """
+
+    FOLLOW_INTERVAL = 30  # Seconds between checks of the saved file by a following process
+
+    def __init__(self, sources, interval, path=None, log=None):
+        self.sources = sources
+        self.interval = interval
+        self.path = path
+        self.log = log
+        self.values = {}
+        self.refreshed = {}
+        self.failures = {}
+        self._loaded_mtime = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def get(self, name, default=None):
+        value = self.values.get(name)
+        return default if value is None else value
+
+    def refresh(self):
+        """Fetch every source once, keeping the previous value of those that fail"""
+        with self._lock:
+            for name, fetch in self.sources.items():
+                try:
+                    value = fetch()
+                except Exception as e:
+                    value = None
+                    if self.log:
+                        self.log.warning('stats.source_error', source=name, error=e)
+                if value is None:
+                    self.failures[name] = self.failures.get(name, 0) + 1
+                    continue
+                # Replace rather than mutate so readers never see a half-updated mapping
+                self.values = {**self.values, name: value}
+                self.refreshed[name] = time.time()
+                self.failures[name] = 0
+            self._save()
+
+    def start(self, owner=True):
+        """Refresh now and then every `interval` seconds on a daemon thread
+
+        With owner=False another process refreshes and saves the snapshot,
+        and this one reloads the saved file whenever it changes.
+        """
+        thread = threading.Thread(target=self._run if owner else self._follow, daemon=True, name='stats-snapshot')
+        thread.start()
+        return thread
+
+    def status(self):
+        now = time.time()
+        return {
+            name: {
+                'available': name in self.values,
+                'age_seconds': round(now - self.refreshed[name], 1) if name in self.refreshed else None,
+                'consecutive_failures': self.failures.get(name, 0)
+            }
+            for name in self.sources
+        }
+
+    def _run(self):
+        while True:
+            self.refresh()
+            if self.interval <= 0:
+                return
+            time.sleep(self.interval)
+
+    def _follow(self):
+        while True:
+            time.sleep(self.FOLLOW_INTERVAL)
+            try:
+                changed = os.path.getmtime(self.path) != self._loaded_mtime
+            except OSError:
+                changed = False
+            if changed:
+                self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            self._loaded_mtime = os.path.getmtime(self.path)
+            with open(self.path, 'rb') as f:
+                saved = fast_json.loads(f.read())
+        except (OSError, ValueError) as e:
+            if self.log:
+                self.log.warning('stats.load_failed', path=self.path, error=e)
+            return
+        self.values = saved.get('values') or {}
+        self.refreshed = saved.get('refreshed') or {}
+
+    def _save(self):
+        if not self.path:
+            return
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(fast_json.dumps({'values': self.values, 'refreshed': self.refreshed}))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            if self.log:
+                self.log.warning('stats.save_failed', path=self.path, error=e)
@@ -0,0 +1,80 @@
+import atexit
+import logging
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+def _format_value(value):
+    if callable(value):
+        value = value()
+    text = str(value)
+    if not text or any(char in text for char in ' "='):
+        return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    return text
+
+class EventFields:
+    """Key/value fields rendered as 'key=value ...' only when a handler formats the record"""
+
+    __slots__ = ('fields',)
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def __str__(self):
+        return ' '.join(f"{key}={_format_value(value)}" for key, value in self.fields.items())
+
+class EventLogger:
+    """Log named events with key/value fields on a standard logger.
+
+    Nothing is formatted unless the level is enabled, and field values that
+    are callables are only called when the record is rendered, on the
+    listener thread when queue logging is active, so they must not depend
+    on the request context. Events marked `sampled` are kept with
+    probability `sample_rate`; each kept record carries the rate so counts
+    can be scaled back.
+    """
+
+    def __init__(self, logger, sample_rate=1.0):
+        self.logger = logger
+        self.sample_rate = sample_rate
+
+    def event(self, level, name, sampled=False, exc_info=None, **fields):
+        if not self.logger.isEnabledFor(level):
+            return
+        if sampled and self.sample_rate < 1.0:
+            if random.random() >= self.sample_rate:
+                return
+            fields['sample_rate'] = self.sample_rate
+        self.logger.log(level, '%s %s', name, EventFields(fields), exc_info=exc_info,
+                        extra={'event': name, 'fields': fields}, stacklevel=3)
+
+    def debug(self, name, sampled=False, **fields):
+        self.event(logging.DEBUG, name, sampled, **fields)
+
+    def info(self, name, sampled=False, **fields):
+        self.event(logging.INFO, name, sampled, **fields)
+
+    def warning(self, name, **fields):
+        self.event(logging.WARNING, name, **fields)
+
+    def error(self, name, **fields):
+        self.event(logging.ERROR, name, **fields)
+
+class _DeferredQueueHandler(QueueHandler):
+    def prepare(self, record):
+        # Leave message formatting to the listener thread
+        return record
+
+def start_queue_logging(logger):
+    """Move the logger's handlers behind a queue drained by a background listener thread"""
+    handlers = [handler for handler in logger.handlers if not isinstance(handler, QueueHandler)]
+    if not handlers:
+        return None
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(_DeferredQueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
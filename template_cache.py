@@ -0,0 +1,47 @@
+import os
+
+from jinja2 import FileSystemBytecodeCache, nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+def bytecode_cache(directory):
+    """Persistent compiled-template cache shared by all workers, or None when disabled"""
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    return FileSystemBytecodeCache(directory, pattern='ethnos_%s.cache')
+
+class FragmentCacheExtension(Extension):
+    """Adds a `{% cache key, ttl %}...{% endcache %}` block that stores rendered HTML.
+
+    The storage is supplied by the application through the environment
+    attributes `fragment_cache_get(key)` and `fragment_cache_set(key, html, ttl)`;
+    while they are unset the block renders its body on every call.
+    """
+
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache_get=None, fragment_cache_set=None)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        if parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        else:
+            args.append(nodes.Const(None))
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render_fragment', args), [], [], body).set_lineno(lineno)
+
+    def _render_fragment(self, key, ttl, caller):
+        get, put = self.environment.fragment_cache_get, self.environment.fragment_cache_set
+        if get is None or put is None:
+            return caller()
+        cache_key = f"fragment:{key}"
+        html = get(cache_key)
+        if html is None:
+            html = str(caller())
+            put(cache_key, html, ttl)
+        return Markup(html)
@@ -0,0 +1,154 @@
+_LIST_KEYS = ('data', 'courses', 'instructors')
+
+def _nested(data, outer, inner):
+    value = data.get(outer)
+    return value.get(inner) if isinstance(value, dict) else None
+
+class ViewModel:
+    """Slim record projected from an Ethnos API payload.
+
+    Listing payloads are projected into models before they enter the
+    response cache, so the cache and the templates only hold the fields that
+    are rendered. Models answer the mapping-style reads used across app.py
+    and the templates (`get`, item access, `in`) and serialize through
+    `to_dict`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_payload(cls, data):
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+class Work(ViewModel):
+    """A work as shown in catalog and homepage listings (no abstract, identifiers or files)"""
+
+    __slots__ = ('id', 'title', 'authors', 'authors_preview', 'author_count', 'year', 'publication_year',
+                 'publication', 'work_type', 'doi', 'doi_url', 'venue', 'venue_name', 'formatted_authors',
+                 'formatted_authors_short', 'is_open_access', 'peer_reviewed', 'relevance_score', 'quality_score')
+    id: int
+    title: str
+    authors: list
+    authors_preview: list
+    author_count: int
+    year: int
+    publication_year: int
+    publication: dict
+    work_type: str
+    doi: str
+    doi_url: str
+    venue: dict
+    venue_name: str
+    formatted_authors: str
+    formatted_authors_short: str
+    is_open_access: bool
+    peer_reviewed: bool
+    relevance_score: float
+    quality_score: int
+
+    @classmethod
+    def from_payload(cls, data):
+        work = super().from_payload(data)
+        publication = data.get('publication')
+        if isinstance(publication, dict):
+            work.publication = {'year': publication.get('year'), 'open_access': publication.get('open_access')}
+        venue = data.get('venue')
+        if isinstance(venue, dict):
+            work.venue = {'id': venue.get('id'), 'name': venue.get('name')}
+        return work
+
+class Venue(ViewModel):
+    __slots__ = ('id', 'name', 'type', 'works_count', 'publisher_name', 'issn', 'eissn')
+    id: int
+    name: str
+    type: str
+    works_count: int
+    publisher_name: str
+    issn: str
+    eissn: str
+
+class Organization(ViewModel):
+    __slots__ = ('id', 'name', 'type', 'country', 'researchers_count', 'ror_id')
+    id: int
+    name: str
+    type: str
+    country: str
+    researchers_count: int
+    ror_id: str
+
+    @classmethod
+    def from_payload(cls, data):
+        return cls(id=data.get('id'), name=data.get('name'), type=data.get('type'),
+                   country=_nested(data, 'location', 'country_code') or data.get('country'),
+                   researchers_count=_nested(data, 'metrics', 'affiliated_authors_count') or data.get('persons_count'),
+                   ror_id=_nested(data, 'identifiers', 'ror_id'))
+
+class Person(ViewModel):
+    __slots__ = ('id', 'preferred_name', 'orcid', 'works_count')
+    id: int
+    preferred_name: str
+    orcid: str
+    works_count: int
+
+    @classmethod
+    def from_payload(cls, data):
+        return cls(id=data.get('id'), preferred_name=data.get('preferred_name'), orcid=data.get('orcid'),
+                   works_count=_nested(data, 'metrics', 'works_count'))
+
+class Course(ViewModel):
+    __slots__ = ('id', 'name', 'code', 'year', 'semester', 'instructors', 'bibliography_count')
+    id: int
+    name: str
+    code: str
+    year: int
+    semester: int
+    instructors: str
+    bibliography_count: int
+
+class Instructor(ViewModel):
+    __slots__ = ('person_id', 'preferred_name', 'courses_taught', 'earliest_year', 'latest_year',
+                 'bibliography_contributed')
+    person_id: int
+    preferred_name: str
+    courses_taught: int
+    earliest_year: int
+    latest_year: int
+    bibliography_contributed: int
+
+    def __repr__(self):
+        return f"Instructor(person_id={self.person_id!r})"
+
+def project_payload(payload, model):
+    """Copy of a listing payload with its records projected into `model` instances"""
+    if not isinstance(payload, dict):
+        return payload
+    projected = dict(payload)
+    for key in _LIST_KEYS:
+        if isinstance(payload.get(key), list):
+            projected[key] = [model.from_payload(item) for item in payload[key] if isinstance(item, dict)]
+    return projected